@@ -1,11 +1,36 @@
-from django.contrib import admin
+from time import perf_counter
 
-from .models import Comment, News
+from django.conf import settings
+from django.contrib import admin, messages
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.html import format_html
+
+from .deletion import soft_delete_news
+from .forms import banned_terms
+from .models import BannedTerm, Comment, News
+from .moderation import moderate_comments
+
+
+class LatestCommentsFormSet(BaseInlineFormSet):
+    """Только последние ADMIN_NEWS_COMMENTS комментариев к новости."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not queryset.query.is_sliced:
+            self._queryset = queryset.select_related('author').order_by(
+                '-created', '-id'
+            )[:settings.ADMIN_NEWS_COMMENTS]
+        return self._queryset
 
 
 class CommentInline(admin.StackedInline):
     model = Comment
+    formset = LatestCommentsFormSet
     extra = 0
+    # Выпадающий список всех пользователей в каждой форме
+    # не помещается в страницу на больших базах.
+    raw_id_fields = ('author',)
 
 
 @admin.register(News)
@@ -13,3 +38,91 @@ class NewsAdmin(admin.ModelAdmin):
     inlines = [
         CommentInline,
     ]
+    list_display = ('__str__', 'date', 'deleted')
+    # Помеченную к удалению новость можно найти и вернуть на сайт,
+    # сняв флажок, пока её не удалил purge_news.
+    list_filter = ('deleted',)
+    readonly_fields = ('all_comments',)
+
+    @admin.display(description='Комментарии')
+    def all_comments(self, news):
+        if news.pk is None:
+            return '-'
+        url = reverse('admin:news_comment_changelist')
+        return format_html(
+            '<a href="{}?news__id__exact={}">Все комментарии ({})</a>',
+            url, news.pk, news.comment_set.count()
+        )
+
+    def get_deleted_objects(self, objs, request):
+        """
+        Подтверждение удаления без списка всех комментариев.
+
+        Новости только помечаются удалёнными, комментарии удаляет
+        purge_news, поэтому собирать их для страницы не нужно.
+        """
+        deleted_objects = [str(news) for news in objs]
+        model_count = {News._meta.verbose_name_plural: len(deleted_objects)}
+        perms_needed = set()
+        if not self.has_delete_permission(request):
+            perms_needed.add(News._meta.verbose_name)
+        return deleted_objects, model_count, perms_needed, []
+
+    def delete_model(self, request, obj):
+        soft_delete_news(News.all_objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        soft_delete_news(queryset)
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    actions = ('hide_comments', 'hide_banned_comments', 'delete_comments')
+    list_display = ('__str__', 'news', 'author', 'created', 'hidden')
+    list_filter = ('hidden',)
+    list_select_related = ('news', 'author')
+    raw_id_fields = ('news', 'author')
+    # Точное совпадение имени ищется по уникальному индексу username.
+    search_fields = ('author__username__exact',)
+    # Сортировка по id не требует сортировки всей таблицы.
+    ordering = ('-id',)
+    # Не считаем все комментарии при каждом открытии списка.
+    show_full_result_count = False
+
+    def moderate(self, request, queryset, action, **kwargs):
+        start = perf_counter()
+        count = moderate_comments(queryset, **kwargs)
+        elapsed = perf_counter() - start
+        self.message_user(
+            request,
+            f'{action} комментариев: {count} за {elapsed:.1f} с.',
+            messages.SUCCESS
+        )
+
+    @admin.action(
+        description='Скрыть выбранные комментарии',
+        permissions=('change',)
+    )
+    def hide_comments(self, request, queryset):
+        self.moderate(request, queryset, 'Скрыто')
+
+    @admin.action(
+        description='Скрыть выбранные комментарии с запрещёнными словами',
+        permissions=('change',)
+    )
+    def hide_banned_comments(self, request, queryset):
+        self.moderate(
+            request, queryset, 'Скрыто', matcher=banned_terms.get_matcher()
+        )
+
+    @admin.action(
+        description='Удалить выбранные комментарии пачками',
+        permissions=('delete',)
+    )
+    def delete_comments(self, request, queryset):
+        self.moderate(request, queryset, 'Удалено', delete=True)
+
+
+@admin.register(BannedTerm)
+class BannedTermAdmin(admin.ModelAdmin):
+    search_fields = ('term',)
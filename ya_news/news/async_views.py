@@ -0,0 +1,70 @@
+"""
+Асинхронные варианты страниц для чтения, для запуска под ASGI.
+
+Включаются настройкой ASYNC_READ_VIEWS. В Django 3.2 ORM синхронный,
+поэтому работа с базой и рендеринг шаблона выполняются одним вызовом
+sync_to_async, а не двумя, как у синхронного представления под ASGI.
+Закэшированная страница для анонимного пользователя отдаётся прямо
+из цикла событий, без перехода в поток.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from .cache import DETAIL_PAGE_KEY, HOME_PAGE_KEY, cached_page_response
+from .views import NewsDetailView, NewsList
+
+news_list_view = NewsList.as_view()
+news_detail_view = NewsDetailView.as_view()
+
+
+def render_view(view, request, **kwargs):
+    """Вызывает синхронное представление и сразу рендерит ответ."""
+    response = view(request, **kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+render_in_thread = sync_to_async(render_view, thread_sensitive=True)
+
+
+def get_cached_page(request, key):
+    """
+    Страница из кэша, если пользователь точно анонимный.
+
+    Без cookie сессии пользователь анонимный, и для проверки
+    не нужна база. Кэш LocMemCache не обращается к сети,
+    поэтому читать его из цикла событий можно.
+
+    Сессия здесь не читается, и Vary: Cookie, который ставит
+    SessionMiddleware, добавляется вручную: иначе браузер покажет
+    сохранённую анонимную страницу и после входа.
+    """
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return None
+    cached_page = cache.get(key)
+    if cached_page is None:
+        return None
+    response = cached_page_response(request, cached_page)
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+async def news_list(request):
+    """Список новостей."""
+    response = get_cached_page(request, HOME_PAGE_KEY)
+    if response is None:
+        response = await render_in_thread(news_list_view, request)
+    return response
+
+
+async def news_detail(request, pk):
+    """Страница новости: просмотр и добавление комментария."""
+    response = None
+    if request.method == 'GET':
+        response = get_cached_page(request, DETAIL_PAGE_KEY.format(pk=pk))
+    if response is None:
+        response = await render_in_thread(news_detail_view, request, pk=pk)
+    return response
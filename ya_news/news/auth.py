@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_KEY = 'news:user:{pk}'
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(USER_KEY.format(pk=user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend, который берёт пользователя сессии из кэша.
+
+    Запись живёт USER_CACHE_TIMEOUT секунд и удаляется раньше,
+    когда пользователь сохраняется (в том числе при смене пароля),
+    удаляется или выходит из системы.
+    """
+
+    def get_user(self, user_id):
+        key = USER_KEY.format(pk=user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
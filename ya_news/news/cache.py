@@ -0,0 +1,120 @@
+from hashlib import md5
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .models import News
+
+HOME_PAGE_KEY = 'news:page:home'
+DETAIL_PAGE_KEY = 'news:page:detail:{pk}'
+
+
+def bump_comments_version(*news_ids):
+    """Меняем версию комментариев новостей при каждой их записи."""
+    News.all_objects.filter(pk__in=news_ids).update(
+        comments_version=F('comments_version') + 1
+    )
+
+
+def invalidate_news_pages(news_id):
+    """Сбрасываем кэш страницы новости и главной страницы."""
+    cache.delete_many((HOME_PAGE_KEY, DETAIL_PAGE_KEY.format(pk=news_id)))
+
+
+def cached_page_response(request, cached_page):
+    """
+    Ответ из закэшированной страницы.
+
+    Вместе со страницей хранится её ETag, поэтому повторный запрос
+    получает 304 Not Modified без обращения к базе.
+    """
+    content, etag = cached_page
+    response = HttpResponse(content)
+    if etag:
+        response['ETag'] = etag
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+class AnonymousPageCacheMixin:
+    """
+    Кэширует отрендеренную страницу для анонимных пользователей.
+
+    Авторизованным пользователям страница собирается заново:
+    в ней есть форма и ссылки, которые зависят от пользователя.
+    """
+
+    def get_page_cache_key(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        key = self.get_page_cache_key()
+        cached_page = cache.get(key)
+        if cached_page is not None:
+            return cached_page_response(request, cached_page)
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            response.add_post_render_callback(
+                lambda response: cache.set(
+                    key,
+                    (response.content, response.get('ETag')),
+                    settings.NEWS_PAGE_CACHE_TIMEOUT
+                )
+            )
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Отвечает 304 Not Modified, если страница не изменилась.
+
+    Если в запросе есть If-None-Match, состояние страницы
+    get_page_state() читается одним запросом и сверяется с ETag
+    до рендеринга шаблона. В ETag входит пользователь: авторизованным
+    страница показывается с формой и ссылками, которых нет у анонимных.
+    Для них в ETag входит и секрет CSRF: после нового входа он другой,
+    и страница с прежним токеном из кэша браузера не годится для POST.
+
+    Last-Modified не отдаётся: правку новости или скрытие комментария
+    не выразить временем, которое хранится в базе, а ETag их замечает.
+    """
+
+    def get_page_state(self):
+        """Значения, от которых зависит страница; None, если её нет."""
+        raise NotImplementedError
+
+    def get_etag(self):
+        values = self.get_page_state()
+        if values is None:
+            return None
+        user = self.request.user
+        csrf_secret = None
+        if user.is_authenticated:
+            csrf_secret = self.request.META.get('CSRF_COOKIE')
+        return quote_etag(
+            md5(repr((values, user.pk, csrf_secret)).encode()).hexdigest()
+        )
+
+    def get(self, request, *args, **kwargs):
+        is_conditional = 'HTTP_IF_NONE_MATCH' in request.META
+        if is_conditional:
+            etag = self.get_etag()
+            response = get_conditional_response(request, etag=etag)
+            if response is not None:
+                return response
+        response = super().get(request, *args, **kwargs)
+        if response.status_code != HTTPStatus.OK:
+            return response
+        if not is_conditional:
+            # Без условных заголовков ETag нужен только для ответа,
+            # и страница может посчитать его по уже загруженным данным.
+            etag = self.get_etag()
+        if etag is not None:
+            response['ETag'] = etag
+        return response
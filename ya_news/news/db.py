@@ -0,0 +1,19 @@
+from django.conf import settings
+
+
+def get_pragma_statements(pragmas):
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+def apply_sqlite_pragmas(connection):
+    """
+    Применяет SQLITE_PRAGMAS к каждому новому соединению с SQLite.
+
+    Большинство настроек действует только в пределах соединения,
+    поэтому их нужно повторять при каждом подключении.
+    """
+    if connection.vendor != 'sqlite' or not settings.SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        for statement in get_pragma_statements(settings.SQLITE_PRAGMAS):
+            cursor.execute(statement)
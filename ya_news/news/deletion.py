@@ -0,0 +1,37 @@
+from .cache import invalidate_news_pages
+from .models import Comment, News
+from .moderation import moderate_comments
+
+
+def soft_delete_news(news):
+    """
+    Помечает новости удалёнными одним UPDATE.
+
+    Новости сразу пропадают с сайта, а их комментарии потом
+    удаляет пачками команда purge_news.
+    """
+    news_ids = list(news.values_list('pk', flat=True))
+    News.all_objects.filter(pk__in=news_ids).update(deleted=True)
+    for news_id in news_ids:
+        invalidate_news_pages(news_id)
+    return len(news_ids)
+
+
+def purge_news(news_id, chunk_size=None, progress=None):
+    """
+    Удаляет помеченную новость вместе с комментариями.
+
+    Комментарии удаляются пачками, каждая в своей транзакции, так что
+    ни память процесса, ни блокировка записи не растут с их числом.
+    Сама новость удаляется последней, когда комментариев уже нет.
+    Возвращает число удалённых комментариев.
+    """
+    count = moderate_comments(
+        Comment.objects.filter(news_id=news_id),
+        delete=True,
+        chunk_size=chunk_size,
+        progress=progress,
+        by_news=True,
+    )
+    News.all_objects.filter(pk=news_id, deleted=True).delete()
+    return count
@@ -0,0 +1,72 @@
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.views import generic
+
+from news.models import News
+from news.views import NewsComment, NewsDetail, NewsDetailView
+
+
+class LegacyNewsDetailView(generic.View):
+    """Прежняя диспетчеризация: представления собираются на каждый запрос."""
+
+    def get(self, request, *args, **kwargs):
+        view = NewsDetail.as_view()
+        return view(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        view = NewsComment.as_view()
+        return view(request, *args, **kwargs)
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет число запросов в секунду к news:detail (GET и POST) '
+        'для прежней и текущей диспетчеризации NewsDetailView. '
+        'Данные создаются в транзакции и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+
+    def measure(self, view, make_request, news_pk, count):
+        start = perf_counter()
+        for _ in range(count):
+            response = view(make_request(), pk=news_pk)
+            if hasattr(response, 'render'):
+                response.render()
+        return count / (perf_counter() - start)
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        factory = RequestFactory()
+        with transaction.atomic():
+            user = get_user_model().objects.create(username='bench')
+            news = News.objects.create(title='Заголовок', text='Текст')
+
+            def make_get():
+                request = factory.get('/')
+                request.user = user
+                return request
+
+            def make_post():
+                request = factory.post('/', {'text': 'Комментарий'})
+                request.user = user
+                return request
+
+            for method, make_request in (('GET', make_get),
+                                         ('POST', make_post)):
+                for name, view_class in (
+                    ('прежняя', LegacyNewsDetailView),
+                    ('текущая', NewsDetailView),
+                ):
+                    rps = self.measure(
+                        view_class.as_view(), make_request, news.pk, count
+                    )
+                    self.stdout.write(
+                        f'{method} news:detail, {name}: {rps:.0f} запросов/с'
+                    )
+            transaction.set_rollback(True)
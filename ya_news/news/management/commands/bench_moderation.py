@@ -0,0 +1,65 @@
+import random
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news.moderation import TermMatcher
+
+ALPHABET = 'абвгдежзийклмнопрстуфхцчшщыэюя'
+
+
+def legacy_search(terms, text):
+    """Прежняя проверка из CommentForm.clean_text."""
+    lowered_text = text.lower()
+    for word in terms:
+        if word in lowered_text:
+            return True
+    return False
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость проверки комментария на запрещённые слова: '
+        'перебор списка против TermMatcher.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--terms', type=int, default=10_000)
+        parser.add_argument('--text-length', type=int, default=2_000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def random_word(self, rng, min_length, max_length):
+        length = rng.randint(min_length, max_length)
+        return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        terms = {
+            self.random_word(rng, 5, 12) for _ in range(options['terms'])
+        }
+        words = []
+        while sum(len(word) + 1 for word in words) < options['text_length']:
+            words.append(self.random_word(rng, 2, 10))
+        # Худший случай для перебора: в тексте нет ни одного слова из списка.
+        text = ' '.join(words)
+        repeat = options['repeat']
+
+        build_time = timeit.timeit(lambda: TermMatcher(terms), number=1)
+        matcher = TermMatcher(terms)
+        if matcher.search(text) != legacy_search(terms, text):
+            raise CommandError('Результаты проверок не совпадают.')
+        legacy_time = timeit.timeit(
+            lambda: legacy_search(terms, text), number=repeat
+        ) / repeat
+        matcher_time = timeit.timeit(
+            lambda: matcher.search(text), number=repeat
+        ) / repeat
+
+        self.stdout.write(
+            f'Слов в списке: {len(terms)}, длина текста: {len(text)}\n'
+            f'Сборка TermMatcher: {build_time * 1000:.1f} мс\n'
+            f'Перебор списка: {legacy_time * 1000:.3f} мс на текст\n'
+            f'TermMatcher: {matcher_time * 1000:.3f} мс на текст\n'
+            f'Ускорение: {legacy_time / matcher_time:.1f}x'
+        )
@@ -0,0 +1,192 @@
+import asyncio
+import inspect
+import socket
+import subprocess
+import sys
+import time
+from argparse import SUPPRESS
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import resolve
+
+from news.metrics import percentile
+
+SERVERS = {
+    'wsgi': 'WSGI, синхронные представления',
+    'asgi': 'ASGI, синхронные представления',
+    'asgi-async': 'ASGI, асинхронные представления',
+}
+HOST = '127.0.0.1'
+# Запрос, на который нет ответа дольше этого времени, считается ошибкой.
+REQUEST_TIMEOUT = 10
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+async def read_response(reader):
+    """Читает ответ; возвращает статус и признак закрытия соединения."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+        closed = headers.get('connection', '').lower() == 'close'
+    else:
+        await reader.read()
+        closed = True
+    return int(status_line.split()[1]), closed
+
+
+async def send_request(connection, port, request):
+    """Отправляет запрос, при необходимости открыв соединение."""
+    if connection is None:
+        connection = await asyncio.open_connection(HOST, port)
+    reader, writer = connection
+    writer.write(request)
+    status, closed = await read_response(reader)
+    return connection, status, closed
+
+
+async def client(port, path, deadline, latencies, errors):
+    """Одно соединение keep-alive, которое шлёт запросы до deadline."""
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'
+    ).encode()
+    connection = None
+    writer = None
+    while time.monotonic() < deadline:
+        start = perf_counter()
+        try:
+            connection, status, closed = await asyncio.wait_for(
+                send_request(connection, port, request), REQUEST_TIMEOUT
+            )
+            writer = connection[1]
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            errors.append(None)
+            if writer is not None:
+                writer.close()
+            connection = writer = None
+            continue
+        if status == 200:
+            latencies.append((perf_counter() - start) * 1000)
+        else:
+            errors.append(status)
+        if closed:
+            writer.close()
+            connection = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(port, path, connections, duration):
+    latencies = []
+    errors = []
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(
+        client(port, path, deadline, latencies, errors)
+        for _ in range(connections)
+    ))
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность WSGI- и ASGI-сервера '
+        '(uvicorn) на странице для чтения при разном числе '
+        'одновременных соединений. Нужен пакет uvicorn '
+        'и база с применёнными миграциями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/')
+        parser.add_argument(
+            '--connections', type=int, nargs='+', default=[50, 200, 1000]
+        )
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument(
+            '--servers', nargs='+', choices=SERVERS, default=list(SERVERS)
+        )
+        # Внутренний режим: команда запускает сервер в дочернем процессе.
+        parser.add_argument('--serve', choices=SERVERS, help=SUPPRESS)
+        parser.add_argument('--port', type=int, help=SUPPRESS)
+
+    def execute(self, *args, **options):
+        if options.get('serve'):
+            # Проверки импортируют news.urls, и выбор представлений
+            # закрепляется до serve(), где меняется ASYNC_READ_VIEWS.
+            settings.ASYNC_READ_VIEWS = options['serve'] == 'asgi-async'
+        return super().execute(*args, **options)
+
+    def serve(self, server, port):
+        is_async = inspect.iscoroutinefunction(resolve('/').func)
+        if is_async != settings.ASYNC_READ_VIEWS:
+            raise CommandError(
+                'Маршруты собраны с другим значением ASYNC_READ_VIEWS.'
+            )
+        if server == 'wsgi':
+            from django.core.servers.basehttp import run
+            from django.core.wsgi import get_wsgi_application
+            run(HOST, port, get_wsgi_application(), threading=True)
+        else:
+            import uvicorn
+            from django.core.asgi import get_asgi_application
+            uvicorn.run(
+                get_asgi_application(), host=HOST, port=port,
+                log_level='warning', access_log=False
+            )
+
+    def start_server(self, server):
+        port = get_free_port()
+        process = subprocess.Popen(
+            [sys.executable, sys.argv[0], 'bench_servers',
+             '--serve', server, '--port', str(port)],
+            stderr=subprocess.DEVNULL,
+        )
+        for _ in range(100):
+            try:
+                socket.create_connection((HOST, port), timeout=1).close()
+                return process, port
+            except OSError:
+                time.sleep(0.1)
+        process.kill()
+        raise CommandError(f'Сервер {server} не запустился.')
+
+    def handle(self, *args, **options):
+        if options['serve']:
+            return self.serve(options['serve'], options['port'])
+        if any(server.startswith('asgi') for server in options['servers']):
+            try:
+                import uvicorn  # noqa: F401
+            except ImportError:
+                raise CommandError(
+                    'Для ASGI нужен uvicorn: pip install uvicorn'
+                )
+        for server in options['servers']:
+            process, port = self.start_server(server)
+            try:
+                for connections in options['connections']:
+                    latencies, errors = asyncio.run(run_load(
+                        port, options['path'], connections,
+                        options['duration']
+                    ))
+                    rps = len(latencies) / options['duration']
+                    p50 = percentile(latencies, 0.5) if latencies else 0
+                    p99 = percentile(latencies, 0.99) if latencies else 0
+                    self.stdout.write(
+                        f'{SERVERS[server]}, {connections} соединений: '
+                        f'{rps:.0f} запросов/с, p50 {p50:.1f} мс, '
+                        f'p99 {p99:.1f} мс, ошибок {len(errors)}'
+                    )
+            finally:
+                process.terminate()
+                process.wait()
@@ -0,0 +1,134 @@
+import multiprocessing
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from news.db import get_pragma_statements
+from news.metrics import percentile
+from yanews import settings_production
+
+SCHEMA = (
+    'CREATE TABLE comment ('
+    'id INTEGER PRIMARY KEY, news_id INTEGER, text TEXT, created REAL)',
+    'CREATE INDEX comment_news_created ON comment (news_id, created, id)',
+)
+NEWS_COUNT = 100
+READ_QUERY = (
+    'SELECT id, text, created FROM comment WHERE news_id = ? '
+    'ORDER BY created, id LIMIT 50'
+)
+WRITE_QUERY = 'INSERT INTO comment (news_id, text, created) VALUES (?, ?, ?)'
+
+
+def connect(path, pragmas):
+    connection = sqlite3.connect(path)
+    for statement in get_pragma_statements(pragmas):
+        connection.execute(statement)
+    return connection
+
+
+def run_operation(connection, role, number):
+    news_id = number % NEWS_COUNT
+    if role == 'write':
+        connection.execute(
+            WRITE_QUERY, (news_id, 'Текст комментария', time.time())
+        )
+        connection.commit()
+    else:
+        connection.execute(READ_QUERY, (news_id,)).fetchall()
+
+
+def worker(role, path, pragmas, persistent, duration, results):
+    """
+    Выполняет операции до истечения duration.
+
+    Без persistent соединение открывается на каждую операцию,
+    как при CONN_MAX_AGE = 0.
+    """
+    latencies = []
+    errors = 0
+    connection = connect(path, pragmas) if persistent else None
+    deadline = time.monotonic() + duration
+    number = 0
+    while time.monotonic() < deadline:
+        number += 1
+        start = perf_counter()
+        try:
+            if persistent:
+                run_operation(connection, role, number)
+            else:
+                with connect(path, pragmas) as temporary:
+                    run_operation(temporary, role, number)
+                temporary.close()
+        except sqlite3.OperationalError:
+            errors += 1
+            continue
+        latencies.append((perf_counter() - start) * 1000)
+    results.put((role, latencies, errors))
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает работу SQLite при одновременной записи и чтении '
+        'из нескольких процессов: настройки по умолчанию против '
+        'профиля yanews.settings_production (WAL, PRAGMA, постоянные '
+        'соединения). База создаётся во временном каталоге.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument('--comments', type=int, default=10_000)
+
+    def create_database(self, path, count):
+        with sqlite3.connect(path) as connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+            connection.executemany(WRITE_QUERY, (
+                (number % NEWS_COUNT, 'Текст комментария', number)
+                for number in range(count)
+            ))
+        connection.close()
+
+    def run_profile(self, path, pragmas, persistent, options):
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(
+                role, path, pragmas, persistent, options['duration'], results
+            ))
+            for role, count in (('write', options['writers']),
+                                ('read', options['readers']))
+            for _ in range(count)
+        ]
+        for process in processes:
+            process.start()
+        stats = {'write': ([], 0), 'read': ([], 0)}
+        for _ in processes:
+            role, latencies, errors = results.get()
+            role_latencies, role_errors = stats[role]
+            stats[role] = (role_latencies + latencies, role_errors + errors)
+        for process in processes:
+            process.join()
+        return stats
+
+    def handle(self, *args, **options):
+        for name, pragmas, persistent in (
+            ('по умолчанию', {}, False),
+            ('production', settings_production.SQLITE_PRAGMAS, True),
+        ):
+            with tempfile.TemporaryDirectory() as directory:
+                path = str(Path(directory) / 'bench.sqlite3')
+                self.create_database(path, options['comments'])
+                stats = self.run_profile(path, pragmas, persistent, options)
+            for role, (latencies, errors) in stats.items():
+                rps = len(latencies) / options['duration']
+                p99 = percentile(latencies, 0.99) if latencies else 0
+                self.stdout.write(
+                    f'{name}, {role}: {rps:.0f} операций/с, '
+                    f'p99 {p99:.1f} мс, ошибок «database is locked»: {errors}'
+                )
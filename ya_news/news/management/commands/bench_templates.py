@@ -0,0 +1,124 @@
+from statistics import mean, median
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+
+from news.forms import CommentForm
+from news.models import Comment, News
+
+TEMPLATE_NAME = 'news/detail.html'
+# Шаблоны, из которых собирается страница новости.
+PAGE_TEMPLATES = (
+    TEMPLATE_NAME,
+    'base.html',
+    'includes/header.html',
+    'includes/errors.html',
+    'news/includes/comments.html',
+)
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def make_backend(loaders):
+    """Движок шаблонов из настроек проекта с заданными загрузчиками."""
+    config = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': 'bench',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **config['OPTIONS'],
+            'debug': False,
+            'loaders': loaders,
+        },
+    })
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет время рендеринга news/detail.html с --comments '
+        'комментариями без кэша шаблонов, с кэширующим загрузчиком '
+        'на первом запросе и после прогрева. '
+        'Данные создаются в транзакции и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=500)
+        parser.add_argument('--renders', type=int, default=200)
+
+    def measure(self, backend, context, request, count):
+        timings = []
+        for _ in range(count):
+            start = perf_counter()
+            backend.get_template(TEMPLATE_NAME).render(context, request)
+            timings.append((perf_counter() - start) * 1000)
+        return timings
+
+    def measure_parsing(self, backend, count):
+        timings = []
+        for _ in range(count):
+            start = perf_counter()
+            for name in PAGE_TEMPLATES:
+                backend.engine.get_template(name)
+            timings.append((perf_counter() - start) * 1000)
+        return timings
+
+    def report(self, name, timings):
+        self.stdout.write(
+            f'{name}: среднее {mean(timings):.2f} мс, '
+            f'медиана {median(timings):.2f} мс'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user_model = get_user_model()
+            author = user_model.objects.create(username='bench_author')
+            user = user_model.objects.create(username='bench_reader')
+            news = News.objects.create(title='Заголовок', text='Текст')
+            Comment.objects.bulk_create(
+                Comment(news=news, author=author, text=f'Комментарий {index}')
+                for index in range(options['comments'])
+            )
+            request = RequestFactory().get('/')
+            request.user = user
+            context = {
+                'news': news,
+                'news_id': news.pk,
+                'comments': list(
+                    news.comment_set.select_related('author')
+                ),
+                'form': CommentForm(),
+                # Фрагмент комментариев рендерится каждый раз,
+                # а не берётся из кэша.
+                'comments_cache_timeout': 0,
+            }
+            self.report(
+                'разбор шаблонов страницы',
+                self.measure_parsing(make_backend(LOADERS), options['renders'])
+            )
+            self.report(
+                'без кэша шаблонов',
+                self.measure(
+                    make_backend(LOADERS), context, request,
+                    options['renders']
+                )
+            )
+            cached = make_backend([
+                ('django.template.loaders.cached.Loader', LOADERS),
+            ])
+            self.report(
+                'кэширующий загрузчик, первый рендеринг',
+                self.measure(cached, context, request, 1)
+            )
+            self.report(
+                'кэширующий загрузчик после прогрева',
+                self.measure(cached, context, request, options['renders'])
+            )
+            transaction.set_rollback(True)
@@ -0,0 +1,78 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+
+from news import views
+from news.models import Comment, News
+from news.pagination import encode_cursor, get_comments_queryset
+
+# Строка плана SQLite вида «SCAN news_comment» без «USING INDEX»
+# означает полный проход по таблице.
+FULL_SCAN = re.compile(r'\bSCAN (?:TABLE )?\w+$')
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет EXPLAIN QUERY PLAN для запросов представлений '
+        'и завершается ошибкой, если какой-то из них сканирует '
+        'таблицу целиком.'
+    )
+
+    def get_view(self, view_class, **kwargs):
+        request = RequestFactory().get('/')
+        request.user = get_user_model()(pk=1)
+        view = view_class()
+        view.setup(request, **kwargs)
+        return view
+
+    def get_querysets(self):
+        """Запросы представлений с произвольными значениями параметров."""
+        page_size = settings.COMMENTS_PAGE_SIZE + 1
+        cursor = encode_cursor(Comment(pk=1, created=timezone.now()))
+        return (
+            ('news:home', self.get_view(views.NewsList).get_queryset()),
+            ('news:detail', News.objects.filter(pk=1)),
+            ('news:detail comments', get_comments_queryset(1)[:page_size]),
+            (
+                'news:comments',
+                get_comments_queryset(1, cursor)[:page_size]
+            ),
+            (
+                'news:edit',
+                self.get_view(
+                    views.CommentUpdate, pk=1
+                ).get_queryset().filter(pk=1)
+            ),
+            (
+                'news:delete',
+                self.get_view(
+                    views.CommentDelete, pk=1
+                ).get_queryset().filter(pk=1)
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Проверка планов поддерживается только SQLite.')
+        full_scans = []
+        for name, queryset in self.get_querysets():
+            plan = queryset.explain()
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{name}:\n{plan}')
+            full_scans += [
+                f'{name}: {line}'
+                for line in plan.splitlines()
+                if FULL_SCAN.search(line)
+            ]
+        if full_scans:
+            raise CommandError(
+                'Запросы сканируют таблицы целиком:\n' + '\n'.join(full_scans)
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'Полных сканирований таблиц не обнаружено.'
+        ))
@@ -0,0 +1,175 @@
+import json
+import multiprocessing
+import random
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+
+from news.metrics import percentile
+from news.models import News
+
+User = get_user_model()
+
+# Доли запросов в нагрузке.
+SCENARIO_WEIGHTS = {
+    'home': 50,
+    'detail': 35,
+    'comment': 15,
+}
+
+
+def run_worker(number, user_id, news_ids, duration, random_seed, results):
+    """Процесс нагрузки: случайные запросы из смеси до конца времени."""
+    connections.close_all()
+    rng = random.Random(random_seed + number)
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(User.objects.get(pk=user_id))
+    home_url = reverse('news:home')
+    names = list(SCENARIO_WEIGHTS)
+    weights = list(SCENARIO_WEIGHTS.values())
+    samples = []
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        detail_url = reverse('news:detail', args=(rng.choice(news_ids),))
+        start = perf_counter()
+        if name == 'home':
+            response = client.get(home_url)
+        elif name == 'detail':
+            response = client.get(detail_url)
+        else:
+            response = client.post(
+                detail_url, {'text': 'Комментарий под нагрузкой'}
+            )
+        samples.append((
+            name,
+            (perf_counter() - start) * 1000,
+            response.status_code < 400,
+        ))
+    results.put(samples)
+
+
+def summarize_samples(samples, duration):
+    def latencies(rows):
+        values = [latency for _, latency, _ in rows] or [0]
+        return {
+            'p50': round(percentile(values, 0.5), 2),
+            'p95': round(percentile(values, 0.95), 2),
+            'p99': round(percentile(values, 0.99), 2),
+        }
+
+    by_name = defaultdict(list)
+    for sample in samples:
+        by_name[sample[0]].append(sample)
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / duration, 1),
+        'errors': sum(not ok for _, _, ok in samples),
+        'latency': latencies(samples),
+        'endpoints': {
+            name: {
+                'requests': len(rows),
+                'errors': sum(not ok for _, _, ok in rows),
+                **latencies(rows),
+            }
+            for name, rows in sorted(by_name.items())
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест YaNews: создаёт отдельную базу, наполняет её '
+        'новостями и комментариями, запускает процессы со смесью '
+        'запросов (главная, новость, отправка комментария) и выводит '
+        'задержки p50/p95/p99 и число запросов в секунду в формате JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=200)
+        parser.add_argument(
+            '--comments', type=int, default=20,
+            help='Среднее число комментариев к новости.'
+        )
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=30)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Файл для отчёта JSON.')
+
+    def run_workers(self, options):
+        user_ids = list(User.objects.values_list('pk', flat=True))
+        news_ids = list(News.objects.values_list('pk', flat=True))
+        # Дочерние процессы открывают свои соединения с базой.
+        connections.close_all()
+        # Процессы наследуют настроенный Django и подключение к временной
+        # базе, поэтому нужен fork: при spawn и forkserver они запустились
+        # бы заново с базой из настроек.
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        processes = [
+            context.Process(target=run_worker, args=(
+                number, user_ids[number % len(user_ids)], news_ids,
+                options['duration'], options['seed'], results
+            ))
+            for number in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        samples = []
+        for _ in processes:
+            samples += results.get()
+        for process in processes:
+            process.join()
+        return samples
+
+    def handle(self, *args, **options):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError(
+                'Нагрузочному тесту нужен запуск процессов через fork.'
+            )
+        old_name = connection.settings_dict['NAME']
+        with tempfile.TemporaryDirectory() as directory:
+            connection.settings_dict['TEST']['NAME'] = str(
+                Path(directory) / 'loadtest.sqlite3'
+            )
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                call_command(
+                    'seed',
+                    users=options['users'],
+                    news=options['news'],
+                    comments=options['news'] * options['comments'],
+                    seed=options['seed'],
+                    verbosity=0,
+                )
+                samples = self.run_workers(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+        report = {
+            'project': 'yanews',
+            'workers': options['workers'],
+            'duration': options['duration'],
+            'data': {
+                'news': options['news'],
+                'comments': options['news'] * options['comments'],
+                'users': options['users'],
+            },
+            **summarize_samples(samples, options['duration']),
+        }
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(output, encoding='utf-8')
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,71 @@
+from datetime import datetime
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from news.forms import banned_terms
+from news.models import Comment
+from news.moderation import moderate_comments
+
+
+def parse_date(value):
+    """Дата в формате ГГГГ-ММ-ДД как начало дня в текущем часовом поясе."""
+    return timezone.make_aware(datetime.fromisoformat(value))
+
+
+class Command(BaseCommand):
+    help = (
+        'Скрывает или удаляет комментарии пачками: по автору, по новости, '
+        'за период или с запрещёнными словами. Условия можно сочетать.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--author', help='Имя пользователя.')
+        parser.add_argument('--news', type=int, help='id новости.')
+        parser.add_argument(
+            '--since', type=parse_date, help='Начиная с даты ГГГГ-ММ-ДД.'
+        )
+        parser.add_argument(
+            '--until', type=parse_date, help='Раньше даты ГГГГ-ММ-ДД.'
+        )
+        parser.add_argument(
+            '--banned', action='store_true',
+            help='Только комментарии с запрещёнными словами.'
+        )
+        parser.add_argument(
+            '--delete', action='store_true',
+            help='Удалить комментарии, а не скрыть.'
+        )
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, *args, **options):
+        filters = {
+            'author__username': options['author'],
+            'news_id': options['news'],
+            'created__gte': options['since'],
+            'created__lt': options['until'],
+        }
+        filters = {
+            lookup: value for lookup, value in filters.items()
+            if value is not None
+        }
+        if not filters and not options['banned']:
+            raise CommandError(
+                'Укажите хотя бы одно условие: --author, --news, '
+                '--since, --until или --banned.'
+            )
+        start = perf_counter()
+        count = moderate_comments(
+            Comment.objects.filter(**filters),
+            delete=options['delete'],
+            matcher=banned_terms.get_matcher() if options['banned'] else None,
+            chunk_size=options['chunk_size'],
+            by_news=options['news'] is not None,
+        )
+        elapsed = perf_counter() - start
+        action = 'Удалено' if options['delete'] else 'Скрыто'
+        self.stdout.write(
+            f'{action} комментариев: {count} за {elapsed:.1f} с '
+            f'({count / max(elapsed, 1e-9):.0f} строк/с)'
+        )
@@ -0,0 +1,41 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from news.deletion import purge_news
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет новости, помеченные удалёнными, вместе с комментариями. '
+        'Комментарии удаляются пачками по --chunk-size, каждая в своей '
+        'транзакции.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        total = 0
+        news_ids = News.all_objects.filter(
+            deleted=True
+        ).values_list('pk', flat=True)
+        for news_id in list(news_ids):
+            def progress(count):
+                if options['verbosity'] > 1:
+                    self.stdout.write(
+                        f'Новость {news_id}: удалено комментариев {count}'
+                    )
+
+            count = purge_news(news_id, options['chunk_size'], progress)
+            total += count
+            self.stdout.write(
+                f'Новость {news_id} удалена, комментариев: {count}'
+            )
+        elapsed = perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено комментариев: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с)'
+        ))
@@ -0,0 +1,185 @@
+import random
+import secrets
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from itertools import islice
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import reset_queries, transaction
+from django.utils import timezone
+
+from news.models import Comment, News
+
+User = get_user_model()
+
+WORDS = (
+    'город', 'погода', 'выборы', 'футбол', 'концерт', 'парк', 'мост',
+    'школа', 'дорога', 'выставка', 'музей', 'театр', 'рынок', 'река',
+)
+
+
+def get_comment_counts(rng, news_count, total):
+    """
+    Делит total комментариев между новостями с длинным хвостом.
+
+    Веса берутся из распределения Парето: у большинства новостей
+    комментариев мало, у нескольких — в десятки раз больше среднего.
+    """
+    weights = [rng.paretovariate(1.5) for _ in range(news_count)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    # Остаток от округления раздаём по одному первым новостям.
+    for index in range(total - sum(counts)):
+        counts[index % news_count] += 1
+    return counts
+
+
+@contextmanager
+def explicit_comment_dates():
+    """Отключает auto_now_add у Comment.created, чтобы задать даты самим."""
+    field = Comment._meta.get_field('created')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def bulk_create_in_batches(model, objects, batch_size):
+    """Сохраняет объекты генератора пачками, каждую в своей транзакции."""
+    created = 0
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return created
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        # При DEBUG = True Django хранит текст каждого запроса.
+        reset_queries()
+        created += len(batch)
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу пользователями, новостями и комментариями '
+        'с правдоподобными датами. Записи создаются генераторами '
+        'и сохраняются пачками bulk_create, поэтому память не растёт '
+        'с числом строк.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--news', type=int, default=1_000)
+        parser.add_argument(
+            '--comments', type=int, default=100_000,
+            help='Сколько всего комментариев создать.'
+        )
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='За сколько последних дней распределить новости.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--seed', type=int, help='Зерно генератора.')
+
+    def generate_users(self, count):
+        # Приставка отделяет пользователей этого запуска от прежних.
+        prefix = secrets.token_hex(3)
+        for index in range(count):
+            yield User(username=f'seed-{prefix}-{index}')
+
+    def generate_news(self, count, days):
+        today = timezone.localdate()
+        for index in range(count):
+            words = ' '.join(self.rng.sample(WORDS, 3))
+            yield News(
+                title=f'{words.capitalize()} {index}',
+                text=f'Новость о том, как {words}. ' * 10,
+                date=today - timedelta(days=self.rng.randrange(days)),
+            )
+
+    def generate_comments(self, news, user_ids, counts):
+        """Комментарии к новости появляются от её даты до текущего момента."""
+        now = timezone.now()
+        for (news_id, date), count in zip(news, counts):
+            published = timezone.make_aware(datetime.combine(date, time()))
+            period = (now - published).total_seconds()
+            for _ in range(count):
+                yield Comment(
+                    news_id=news_id,
+                    author_id=self.rng.choice(user_ids),
+                    text=f'Про {self.rng.choice(WORDS)}: интересно.',
+                    created=published + timedelta(
+                        seconds=period * self.rng.random() ** 3
+                    ),
+                )
+
+    def report(self, name, count, start):
+        if self.verbosity < 1:
+            return
+        elapsed = perf_counter() - start
+        self.stdout.write(
+            f'{name}: {count} за {elapsed:.1f} с '
+            f'({count / max(elapsed, 1e-9):.0f} строк/с)'
+        )
+
+    def check_options(self, options):
+        for name in ('users', 'news', 'comments'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} не может быть меньше нуля.')
+        for name in ('days', 'batch_size'):
+            if options[name] < 1:
+                raise CommandError(
+                    f'--{name.replace("_", "-")} должно быть больше нуля.'
+                )
+        if options['comments'] and not (options['users'] and options['news']):
+            raise CommandError(
+                'Для комментариев нужны --users и --news больше нуля.'
+            )
+
+    def handle(self, *args, **options):
+        self.check_options(options)
+        self.rng = random.Random(options['seed'])
+        self.verbosity = options['verbosity']
+        batch_size = options['batch_size']
+        last_user_pk = User.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        last_news_pk = News.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+
+        start = perf_counter()
+        count = bulk_create_in_batches(
+            User, self.generate_users(options['users']), batch_size
+        )
+        self.report('Пользователи', count, start)
+
+        start = perf_counter()
+        count = bulk_create_in_batches(
+            News,
+            self.generate_news(options['news'], options['days']),
+            batch_size
+        )
+        self.report('Новости', count, start)
+
+        # В SQLite bulk_create не возвращает id, поэтому новые записи
+        # находим по id больше прежнего максимального.
+        user_ids = list(User.objects.filter(
+            pk__gt=last_user_pk
+        ).values_list('pk', flat=True))
+        news = list(News.objects.filter(
+            pk__gt=last_news_pk
+        ).order_by('pk').values_list('pk', 'date'))
+        counts = get_comment_counts(
+            self.rng, len(news), options['comments']
+        )
+        start = perf_counter()
+        with explicit_comment_dates():
+            count = bulk_create_in_batches(
+                Comment,
+                self.generate_comments(news, user_ids, counts),
+                batch_size
+            )
+        self.report('Комментарии', count, start)
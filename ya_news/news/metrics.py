@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from pathlib import Path
+from time import monotonic, perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Верхние границы корзин гистограммы задержек, мс.
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+UNRESOLVED_URL_NAME = '<unresolved>'
+
+
+class QueryStats:
+    """Обёртка для execute_wrapper: считает запросы и их время."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += perf_counter() - start
+
+
+class RequestMetrics:
+    """Скользящее окно последних замеров для каждого имени URL."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(
+            lambda: deque(maxlen=settings.REQUEST_METRICS_WINDOW)
+        )
+        self._flushed_at = None
+
+    def add(self, url_name, sample):
+        with self._lock:
+            self._samples[url_name].append(sample)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                url_name: list(samples)
+                for url_name, samples in self._samples.items()
+            }
+
+    def flush(self, force=False):
+        """
+        Сохраняет окно замеров процесса в REQUEST_METRICS_DIR.
+
+        Файл пишется не чаще раза в REQUEST_METRICS_FLUSH_INTERVAL секунд,
+        у каждого процесса он свой: его читает команда request_metrics.
+        """
+        interval = settings.REQUEST_METRICS_FLUSH_INTERVAL
+        if not force and self._flushed_at is not None and (
+                monotonic() - self._flushed_at < interval):
+            return
+        self._flushed_at = monotonic()
+        directory = Path(settings.REQUEST_METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}.json'
+        temporary_path = path.with_suffix('.tmp')
+        temporary_path.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary_path, path)
+
+
+request_metrics = RequestMetrics()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(samples):
+    """Сводка по замерам одного URL: перцентили, средние и гистограмма."""
+    totals = [sample['total'] for sample in samples]
+    histogram = {f'<={bucket}': 0 for bucket in LATENCY_BUCKETS}
+    histogram['inf'] = 0
+    for total in totals:
+        bucket = next(
+            (f'<={bucket}' for bucket in LATENCY_BUCKETS if total <= bucket),
+            'inf'
+        )
+        histogram[bucket] += 1
+    count = len(samples)
+    return {
+        'requests': count,
+        'p50': percentile(totals, 0.5),
+        'p95': percentile(totals, 0.95),
+        'p99': percentile(totals, 0.99),
+        'avg_queries': sum(sample['queries'] for sample in samples) / count,
+        'avg_db': sum(sample['db'] for sample in samples) / count,
+        'avg_template': sum(sample['template'] for sample in samples) / count,
+        'histogram': histogram,
+    }
+
+
+class RequestMetricsMiddleware:
+    """
+    Замеры SQL-запросов, рендеринга шаблонов и общей задержки запроса.
+
+    Включается настройкой REQUEST_METRICS_ENABLED; когда она выключена,
+    Django исключает middleware из цепочки и запросы ничего не платят.
+    Время отдаётся в заголовке Server-Timing (в миллисекундах)
+    и копится в request_metrics по имени URL.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.template_render_time = 0
+        query_stats = QueryStats()
+        start = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_stats))
+            response = self.get_response(request)
+        sample = {
+            'total': (perf_counter() - start) * 1000,
+            'db': query_stats.duration * 1000,
+            'queries': query_stats.count,
+            'template': request.template_render_time * 1000,
+        }
+        response['Server-Timing'] = (
+            f'db;dur={sample["db"]:.2f};desc="{sample["queries"]} queries", '
+            f'tpl;dur={sample["template"]:.2f}, '
+            f'total;dur={sample["total"]:.2f}'
+        )
+        match = request.resolver_match
+        url_name = match.view_name if match else UNRESOLVED_URL_NAME
+        request_metrics.add(url_name, sample)
+        request_metrics.flush()
+        return response
+
+    def process_template_response(self, request, response):
+        start = perf_counter()
+
+        def count_render_time(response):
+            request.template_render_time += perf_counter() - start
+
+        response.add_post_render_callback(count_render_time)
+        return response
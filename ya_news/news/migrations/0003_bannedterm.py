@@ -0,0 +1,25 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BannedTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(help_text='Запрещённое слово или его основа', max_length=100, unique=True, verbose_name='Слово')),
+            ],
+            options={
+                'verbose_name': 'Запрещённое слово',
+                'verbose_name_plural': 'Запрещённые слова',
+                'ordering': ('term',),
+            },
+        ),
+    ]
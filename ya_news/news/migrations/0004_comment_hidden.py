@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_bannedterm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='hidden',
+            field=models.BooleanField(default=False, help_text='Скрытый комментарий не показывается на странице новости', verbose_name='Скрыт'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_comment_hidden'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='deleted',
+            field=models.BooleanField(default=False, help_text='Новость скрыта и будет удалена командой purge_news', verbose_name='Удалена'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.15 on 2026-10-18 22:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_news_deleted'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bannedterm',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now, verbose_name='Изменено'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:13
+
+from django.db import migrations
+import django.db.models.manager
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_bannedterm_updated'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='news',
+            options={'default_manager_name': 'all_objects', 'ordering': ('-date',), 'verbose_name': 'Новость', 'verbose_name_plural': 'Новости'},
+        ),
+        migrations.AlterModelManagers(
+            name='news',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+    ]
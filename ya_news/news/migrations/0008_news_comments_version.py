@@ -0,0 +1,18 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_news_default_manager'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='comments_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
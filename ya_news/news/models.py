@@ -4,13 +4,39 @@ from django.conf import settings
 from django.db import models
 
 
+class PublishedNewsManager(models.Manager):
+    """Новости, кроме помеченных к удалению."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted=False)
+
+
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    deleted = models.BooleanField(
+        'Удалена',
+        default=False,
+        help_text='Новость скрыта и будет удалена командой purge_news'
+    )
+    # Растёт при каждой записи комментариев новости. Версия входит в ключ
+    # кэша фрагмента комментариев и в ETag, и её видят все процессы.
+    comments_version = models.PositiveBigIntegerField(
+        default=0, editable=False
+    )
+
+    # Сайт показывает только objects. Менеджер по умолчанию — all_objects:
+    # через него админка и dumpdata видят и помеченные к удалению новости.
+    objects = PublishedNewsManager()
+    all_objects = models.Manager()
 
     class Meta:
+        default_manager_name = 'all_objects'
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date',), name='news_date_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
@@ -21,7 +47,9 @@ class News(models.Model):
 class Comment(models.Model):
     news = models.ForeignKey(
         News,
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        # Поиск по новости обслуживает составной индекс из Meta.
+        db_index=False,
     )
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -29,9 +57,43 @@ class Comment(models.Model):
     )
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
+    hidden = models.BooleanField(
+        'Скрыт',
+        default=False,
+        help_text='Скрытый комментарий не показывается на странице новости'
+    )
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created', 'id'),
+                name='comment_news_created_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+
+class BannedTerm(models.Model):
+    term = models.CharField(
+        'Слово',
+        max_length=100,
+        unique=True,
+        help_text='Запрещённое слово или его основа'
+    )
+    # По наибольшему времени правки процессы узнают, что список изменился.
+    updated = models.DateTimeField('Изменено', auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ('term',)
+        verbose_name_plural = 'Запрещённые слова'
+        verbose_name = 'Запрещённое слово'
+
+    def __str__(self):
+        return self.term
+
+    def save(self, *args, **kwargs):
+        self.term = self.term.lower()
+        super().save(*args, **kwargs)
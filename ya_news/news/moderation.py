@@ -0,0 +1,251 @@
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+
+from .cache import bump_comments_version, invalidate_news_pages
+from .models import BannedTerm, Comment
+
+# Служебный ключ узла префиксного дерева: на этом узле заканчивается слово.
+TERM_END = ''
+
+
+def build_trie_pattern(terms):
+    """
+    Собирает слова в одно регулярное выражение по префиксному дереву.
+
+    Общие начала слов попадают в выражение один раз, поэтому в каждой
+    позиции текста проверяется не весь список слов, а только ветка
+    дерева, совпадающая с текстом.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[TERM_END] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    is_term_end = TERM_END in node
+    leaves = []
+    branches = []
+    for char in sorted(char for char in node if char != TERM_END):
+        child_pattern = _node_pattern(node[char])
+        if child_pattern:
+            branches.append(re.escape(char) + child_pattern)
+        else:
+            leaves.append(re.escape(char))
+    if len(leaves) == 1:
+        branches.append(leaves[0])
+    elif leaves:
+        branches.append('[' + ''.join(leaves) + ']')
+    if not branches:
+        return ''
+    if len(branches) == 1 and not is_term_end:
+        return branches[0]
+    pattern = '(?:' + '|'.join(branches) + ')'
+    # Жадный квантификатор: сначала пробуем более длинное слово.
+    return pattern + '?' if is_term_end else pattern
+
+
+class TermMatcher:
+    """
+    Поиск запрещённых слов в тексте за один проход.
+
+    Слова ищутся как подстроки без учёта регистра, так что в список
+    можно добавлять основы слов.
+    """
+
+    def __init__(self, terms):
+        self.terms = frozenset(term.lower() for term in terms if term)
+        self.pattern = None
+        self.overlapping_pattern = None
+        if self.terms:
+            pattern = build_trie_pattern(self.terms)
+            self.pattern = re.compile(pattern)
+            # Опережающая проверка не поглощает текст, поэтому
+            # совпадение ищется в каждой позиции.
+            self.overlapping_pattern = re.compile(f'(?=({pattern}))')
+
+    def search(self, text):
+        """Есть ли в тексте хотя бы одно запрещённое слово."""
+        return bool(self.pattern and self.pattern.search(text.lower()))
+
+    def find(self, text):
+        """
+        Запрещённые слова, найденные в тексте.
+
+        В ответ попадают все слова, в том числе пересекающиеся
+        и вложенные друг в друга: «редиска» находит и «редис», и «иск».
+        """
+        if not self.pattern:
+            return set()
+        found = set()
+        for match in self.overlapping_pattern.finditer(text.lower()):
+            # Выражение находит самое длинное слово с этой позиции,
+            # более короткие слова с неё же — его начала.
+            longest = match.group(1)
+            found.update(
+                longest[:end] for end in range(1, len(longest) + 1)
+                if longest[:end] in self.terms
+            )
+        return found
+
+
+def get_banned_terms_version():
+    """
+    Версия списка BannedTerm: время последней правки и число слов.
+
+    Её видит любой процесс. Max берётся по индексу updated,
+    а число слов замечает удаление.
+    """
+    return tuple(BannedTerm.objects.aggregate(
+        Max('updated'), Count('pk')
+    ).values())
+
+
+class BannedTermsCache:
+    """
+    TermMatcher процесса для встроенного списка слов и слов из BannedTerm.
+
+    Версия списка проверяется в базе не чаще раза в
+    BANNED_TERMS_CHECK_INTERVAL секунд, а список читается
+    и компилируется заново, только если она сменилась. Правка
+    BannedTerm в этом процессе вызывает invalidate(), и новая
+    версия проверяется сразу.
+    """
+
+    def __init__(self, base_terms):
+        self.base_terms = tuple(base_terms)
+        self._lock = threading.Lock()
+        self._matcher = None
+        self._version = None
+        self._checked_at = None
+
+    def invalidate(self):
+        self._checked_at = None
+
+    def _needs_check(self):
+        return self._checked_at is None or (
+            time.monotonic() - self._checked_at
+            > settings.BANNED_TERMS_CHECK_INTERVAL
+        )
+
+    def get_matcher(self):
+        if self._needs_check():
+            with self._lock:
+                if self._needs_check():
+                    version = get_banned_terms_version()
+                    if self._matcher is None or self._version != version:
+                        terms = BannedTerm.objects.values_list(
+                            'term', flat=True
+                        )
+                        self._matcher = TermMatcher(
+                            (*self.base_terms, *terms)
+                        )
+                        self._version = version
+                    self._checked_at = time.monotonic()
+        return self._matcher
+
+
+def iter_comment_chunks(comments, chunk_size, matcher=None, by_news=False):
+    """
+    Пары (id, id новости) комментариев пачками.
+
+    Пачки выбираются после последней, без OFFSET: по возрастанию id,
+    а для комментариев одной новости (by_news) — по (created, id),
+    в порядке индекса comment_news_created_idx, чтобы база не сортировала
+    все комментарии новости заново для каждой пачки. С matcher в пачку
+    попадают только комментарии с запрещёнными словами: SQLite не умеет
+    искать кириллицу без учёта регистра, поэтому тексты проверяются
+    в Python.
+    """
+    ordering = ('created', 'pk') if by_news else ('pk',)
+    fields = ['pk', 'news_id']
+    if by_news:
+        fields.append('created')
+    if matcher:
+        fields.append('text')
+    last = None
+    while True:
+        chunk = comments.order_by(*ordering)
+        if last and by_news:
+            created = last[2]
+            chunk = chunk.filter(
+                Q(created__gt=created) | Q(created=created, pk__gt=last[0]),
+                created__gte=created,
+            )
+        elif last:
+            chunk = chunk.filter(pk__gt=last[0])
+        rows = list(chunk.values_list(*fields)[:chunk_size])
+        if not rows:
+            return
+        last = rows[-1]
+        if matcher:
+            rows = [row for row in rows if matcher.search(row[-1])]
+        if rows:
+            yield [row[:2] for row in rows]
+
+
+def delete_comments_by_pk(pks):
+    """
+    Удаляет комментарии одним DELETE ... WHERE id IN (...).
+
+    Обычный delete() из-за обработчиков post_delete загружает
+    и удаляет комментарии по одному. Пока на Comment никто
+    не ссылается, каскад не нужен; если ссылки появятся,
+    удаление идёт через delete(), чтобы каскад не пропал.
+    """
+    if Comment._meta.related_objects:
+        Comment.objects.filter(pk__in=pks).delete()
+        return
+    quote_name = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote_name(Comment._meta.db_table)} '
+            f'WHERE {quote_name(Comment._meta.pk.column)} '
+            f'IN ({placeholders})',
+            pks
+        )
+
+
+def moderate_comments(
+        comments, delete=False, matcher=None, chunk_size=None, progress=None,
+        by_news=False
+):
+    """
+    Скрывает или удаляет комментарии пачками по MODERATION_CHUNK_SIZE.
+
+    Каждая пачка обрабатывается одним UPDATE или DELETE в своей
+    транзакции, так что таблица не блокируется надолго. Сигналы
+    при этом не отправляются, поэтому кэш страниц затронутых
+    новостей сбрасывается здесь. Если все комментарии из одной
+    новости, by_news выбирает их по индексу новости. После каждой
+    пачки progress, если он передан, получает число обработанных
+    комментариев. Возвращает число комментариев.
+    """
+    chunk_size = chunk_size or settings.MODERATION_CHUNK_SIZE
+    if not delete:
+        comments = comments.filter(hidden=False)
+    count = 0
+    for rows in iter_comment_chunks(comments, chunk_size, matcher, by_news):
+        pks = [pk for pk, _ in rows]
+        with transaction.atomic():
+            if delete:
+                delete_comments_by_pk(pks)
+            else:
+                Comment.objects.filter(pk__in=pks).update(hidden=True)
+            news_ids = {news_id for _, news_id in rows}
+            bump_comments_version(*news_ids)
+        for news_id in news_ids:
+            invalidate_news_pages(news_id)
+        count += len(rows)
+        if progress:
+            progress(count)
+    return count
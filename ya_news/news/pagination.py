@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from .models import Comment
+
+CURSOR_SEPARATOR = '_'
+# Наибольшее значение id: в SQLite это 64-битное целое со знаком.
+MAX_ID = 2 ** 63 - 1
+
+
+def encode_cursor(comment):
+    """Курсор указывает на последний показанный комментарий."""
+    value = f'{comment.created.isoformat()}{CURSOR_SEPARATOR}{comment.pk}'
+    return urlsafe_base64_encode(force_bytes(value))
+
+
+def decode_cursor(cursor):
+    """Возвращает пару (created, pk), для битого курсора — ValueError."""
+    try:
+        value = force_str(urlsafe_base64_decode(cursor))
+        created, pk = value.rsplit(CURSOR_SEPARATOR, 1)
+        created, pk = datetime.fromisoformat(created), int(pk)
+        if created.tzinfo is None or not 0 < pk <= MAX_ID:
+            raise ValueError
+        # Дата, которая не переводится в UTC, сломала бы запрос к базе.
+        created.astimezone(timezone.utc)
+    except (ValueError, OverflowError) as error:
+        raise ValueError(f'Некорректный курсор: {cursor}') from error
+    return created, pk
+
+
+def get_comments_queryset(news_id, cursor=None):
+    """
+    Комментарии к новости, следующие за курсором.
+
+    Комментарии упорядочены по (created, id), поэтому выборка продолжается
+    с места остановки без OFFSET: глубокие страницы стоят столько же,
+    сколько первая.
+    """
+    comments = Comment.objects.filter(
+        news_id=news_id, hidden=False
+    ).select_related('author').order_by('created', 'id')
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        # Условие created__gte дублирует OR-ветки, но даёт базе
+        # начать сканирование индекса сразу с нужной позиции.
+        comments = comments.filter(
+            Q(created__gt=created) | Q(created=created, id__gt=pk),
+            created__gte=created,
+        )
+    return comments
+
+
+def get_comments_page(news_id, cursor=None, page_size=None):
+    """
+    Страница комментариев к новости, следующая за курсором.
+
+    Возвращает список комментариев и курсор следующей страницы
+    (None, если страница последняя).
+    """
+    page_size = page_size or settings.COMMENTS_PAGE_SIZE
+    comments = list(
+        get_comments_queryset(news_id, cursor)[:page_size + 1]
+    )
+    next_cursor = None
+    if len(comments) > page_size:
+        comments = comments[:page_size]
+        next_cursor = encode_cursor(comments[-1])
+    return comments, next_cursor
@@ -3,10 +3,12 @@ from datetime import datetime, timedelta
 import pytest
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test.client import Client
 from django.urls import reverse
 from django.utils import timezone
 
+from news.management.commands.seed import explicit_comment_dates
 from news.models import News, Comment
 
 
@@ -73,13 +75,26 @@ def comment(author, new):
 @pytest.fixture
 def comments_for_order_test(author, new):
     now = timezone.now()
-    for index in range(10):
-        comments = Comment.objects.create(
-            news=new, author=author, text=f'Текст {index}'
+    with explicit_comment_dates():
+        comments = Comment.objects.bulk_create(
+            Comment(
+                news=new,
+                author=author,
+                text=f'Текст {index}',
+                created=now + timedelta(days=index),
+            )
+            for index in range(10)
         )
-        comments.created = now + timedelta(days=index)
-        comments.save()
-    return comments
+    return comments[-1]
+
+
+@pytest.fixture
+def comments_for_pagination_test(author, new, settings):
+    settings.COMMENTS_PAGE_SIZE = 3
+    return Comment.objects.bulk_create(
+        Comment(news=new, author=author, text=f'Текст {index}')
+        for index in range(settings.COMMENTS_PAGE_SIZE * 2 + 1)
+    )
 
 
 @pytest.fixture
@@ -132,3 +147,8 @@ def url_to_comments(new_detail_url):
 @pytest.fixture(autouse=True)
 def enable_db_access_for_all_tests(db):
     pass
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
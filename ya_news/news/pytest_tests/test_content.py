@@ -1,9 +1,26 @@
+import json
 import pytest
+from http import HTTPStatus
+from io import StringIO
 
+from asgiref.sync import async_to_sync
 from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import connection
+from django.template import engines
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.http import http_date, urlsafe_base64_encode
 
+from news import async_views
+from news.cache import bump_comments_version, invalidate_news_pages
 from news.forms import CommentForm
+from news.metrics import request_metrics
+from news.models import Comment
+from news.warmup import warm_up_templates
+from yanews import settings_production
 
 
 def test_news_count(client, news_on_home_page):
@@ -25,6 +42,123 @@ def test_news_order(client, news_on_home_page):
     assert all_dates == sorted_dates
 
 
+def test_news_comment_count(client, django_assert_num_queries, comment):
+    """Число комментариев на главной считается одним запросом."""
+    url = reverse('news:home')
+    with django_assert_num_queries(1):
+        response = client.get(url)
+    news = response.context['object_list'].get()
+    assert news.comment_count == 1
+    assert 'Комментариев: 1' in response.content.decode()
+
+
+def test_home_page_cached_for_anonymous(
+        client, django_assert_num_queries, news_on_home_page):
+    """Анонимному пользователю главная отдаётся из кэша."""
+    url = reverse('news:home')
+    client.get(url)
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_async_detail_served_from_cache(
+        rf, django_assert_num_queries, new, new_detail_url):
+    """Асинхронная страница новости отдаётся из кэша без запросов к БД."""
+    request = rf.get(new_detail_url)
+    request.user = AnonymousUser()
+    response = async_to_sync(async_views.news_detail)(request, pk=new.pk)
+    assert response.status_code == HTTPStatus.OK
+    assert new.title in response.content.decode()
+    with django_assert_num_queries(0):
+        cached = async_to_sync(async_views.news_detail)(
+            rf.get(new_detail_url), pk=new.pk
+        )
+    assert cached.content == response.content
+    assert cached['Vary'] == 'Cookie'
+
+
+@pytest.mark.parametrize('name', ('news:home', 'news:detail'))
+def test_not_modified_after_one_query(
+        client, django_assert_num_queries, comment, name):
+    """Неизменившаяся страница отдаётся как 304 не больше чем за запрос."""
+    args = (comment.news_id,) if name == 'news:detail' else ()
+    url = reverse(name, args=args)
+    etag = client.get(url)['ETag']
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    invalidate_news_pages(comment.news_id)
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_etag_changes_with_page(
+        client, author_client, comment, new_detail_url):
+    """Меняется ETag с комментариями и зависит от пользователя."""
+    etag = client.get(new_detail_url)['ETag']
+    assert author_client.get(new_detail_url)['ETag'] != etag
+    comment.text = 'Новый текст'
+    comment.save()
+    response = client.get(new_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+def test_etag_follows_comment_edit_in_other_process(
+        author_client, comment, new_detail_url):
+    """Правку комментария в другом процессе ETag замечает через базу."""
+    etag = author_client.get(new_detail_url)['ETag']
+    # Другой процесс сбрасывает только свой кэш, а версию меняет в базе.
+    Comment.objects.filter(pk=comment.pk).update(text='Новый текст')
+    bump_comments_version(comment.news_id)
+    response = author_client.get(new_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Новый текст' in response.content.decode()
+
+
+def test_comment_posted_after_login_again(author, new, new_detail_url):
+    """После повторного входа страница не 304, и CSRF-токен в ней новый."""
+    author.set_password('пароль')
+    author.save()
+    client = Client(enforce_csrf_checks=True)
+    login_url = reverse('users:login')
+
+    def log_in():
+        client.get(login_url)
+        client.post(login_url, {
+            'username': author.username,
+            'password': 'пароль',
+            'csrfmiddlewaretoken': client.cookies['csrftoken'].value,
+        })
+
+    log_in()
+    etag = client.get(new_detail_url)['ETag']
+    client.get(reverse('users:logout'))
+    log_in()
+    response = client.get(new_detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    response = client.post(new_detail_url, {
+        'text': 'Комментарий',
+        'csrfmiddlewaretoken': response.context['csrf_token'],
+    })
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def test_news_edit_not_hidden_by_if_modified_since(
+        client, new, new_detail_url):
+    """Правку новости не скрывает ответ 304 по If-Modified-Since."""
+    assert 'Last-Modified' not in client.get(new_detail_url)
+    new.title = 'Новый заголовок'
+    new.save()
+    response = client.get(
+        new_detail_url, HTTP_IF_MODIFIED_SINCE=http_date()
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert new.title in response.content.decode()
+
+
 def test_comments_order(client, new, comments_for_order_test):
     """Проверка сортировки комментариев."""
     detail_url = reverse('news:detail', args=(new.id,))
@@ -38,6 +172,54 @@ def test_comments_order(client, new, comments_for_order_test):
     assert all_timestamps == sorted_timestamps
 
 
+def test_comments_pagination(
+        client, new, comments_for_pagination_test, settings):
+    """Комментарии подгружаются страницами по курсору без пропусков."""
+    response = client.get(reverse('news:detail', args=(new.id,)))
+    comments = response.context['comments']
+    assert len(comments) == settings.COMMENTS_PAGE_SIZE
+    next_cursor = response.context['next_cursor']
+    while next_cursor:
+        response = client.get(
+            reverse('news:comments', args=(new.id,)),
+            {'after': next_cursor}
+        )
+        comments += response.context['comments']
+        next_cursor = response.context['next_cursor']
+    all_comments = Comment.objects.filter(news=new).order_by('created', 'id')
+    assert comments == list(all_comments)
+
+
+def test_comments_page_for_missing_news(client):
+    """Страница комментариев несуществующей новости не найдена."""
+    response = client.get(reverse('news:comments', args=(99999,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize('cursor', (
+    'bad',
+    urlsafe_base64_encode(b'2024-01-01T00:00:00+00:00_99999999999999999999'),
+    urlsafe_base64_encode(b'0001-01-01T00:00:00+05:00_1'),
+))
+def test_comments_page_with_bad_cursor(client, new, cursor):
+    """Некорректный курсор — ошибка запроса."""
+    response = client.get(
+        reverse('news:comments', args=(new.id,)), {'after': cursor}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_comment_links_only_for_author(
+        author_client, not_author_client, comment, comment_edit_url,
+        new_detail_url):
+    """Кэш комментариев не показывает ссылки редактирования чужим."""
+    response = author_client.get(new_detail_url)
+    assert comment_edit_url in response.content.decode()
+    response = not_author_client.get(new_detail_url)
+    assert comment.text in response.content.decode()
+    assert comment_edit_url not in response.content.decode()
+
+
 @pytest.mark.parametrize(
     'parametrized_client, form_on_page',
     (
@@ -58,3 +240,64 @@ def test_pages_contains_form(parametrized_client, name, args, form_on_page):
     assert ('form' in response.context) == form_on_page
     if 'form' in response.context:
         assert isinstance(response.context['form'], CommentForm)
+
+
+def test_request_metrics(client, settings, tmp_path, new_detail_url):
+    """Замеры запроса попадают в Server-Timing и сводку команды."""
+    assert 'Server-Timing' not in client.get(new_detail_url)
+    settings.REQUEST_METRICS_ENABLED = True
+    settings.REQUEST_METRICS_DIR = tmp_path
+    response = Client().get(new_detail_url)
+    assert 'db;dur=' in response['Server-Timing']
+    request_metrics.flush(force=True)
+    output = StringIO()
+    call_command('request_metrics', stdout=output)
+    report = json.loads(output.getvalue())
+    assert report['news:detail']['requests'] >= 1
+
+
+def test_admin_news_page_caps_comments(admin_client, settings, author, new):
+    """В админке новости показаны только последние комментарии."""
+    settings.ADMIN_NEWS_COMMENTS = 3
+    Comment.objects.bulk_create(
+        Comment(news=new, author=author, text=f'Текст {index}')
+        for index in range(5)
+    )
+    response = admin_client.get(
+        reverse('admin:news_news_change', args=(new.pk,))
+    )
+    formset = response.context['inline_admin_formsets'][0].formset
+    assert len(formset.forms) == 3
+    assert 'Все комментарии (5)' in response.content.decode()
+
+
+def test_admin_comments_search_by_author(
+        admin_client, author, not_author, comment):
+    """Комментарии в админке ищутся по точному имени автора."""
+    url = reverse('admin:news_comment_changelist')
+    response = admin_client.get(url, {'q': author.username})
+    assert list(response.context['cl'].result_list) == [comment]
+    response = admin_client.get(url, {'q': not_author.username})
+    assert not response.context['cl'].result_list
+
+
+def test_warm_up_fills_template_cache(settings):
+    """Прогрев кладёт шаблоны проекта в кэш загрузчика из боевых настроек."""
+    settings.TEMPLATES = settings_production.TEMPLATES
+    assert warm_up_templates() > 0
+    loader = engines['django'].engine.template_loaders[0]
+    assert {'base.html', 'news/detail.html'} <= set(
+        loader.get_template_cache
+    )
+
+
+def test_logged_in_page_skips_session_and_user_queries(
+        author_client, new_detail_url):
+    """Сессия и пользователь после первого запроса берутся из кэша."""
+    author_client.get(new_detail_url)
+    with CaptureQueriesContext(connection) as context:
+        response = author_client.get(new_detail_url)
+    assert response.context['user'].is_authenticated
+    for query in context.captured_queries:
+        assert 'FROM "django_session"' not in query['sql']
+        assert 'FROM "auth_user"' not in query['sql']
@@ -1,10 +1,28 @@
+import random
+from io import StringIO
+import pytest
 from http import HTTPStatus
 from pytest_django.asserts import assertRedirects, assertFormError
 
-from news.forms import BAD_WORDS, WARNING
-from news.models import Comment
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from news.auth import USER_KEY
+from news.db import apply_sqlite_pragmas
+from news.forms import BAD_WORDS, WARNING, banned_terms
+from news.management.commands.loadtest import summarize_samples
+from news.management.commands.seed import get_comment_counts
+from news.models import BannedTerm, Comment, News
+from news.moderation import BannedTermsCache, TermMatcher
 from news.utils import comment_counter
 
+# Пользователь, новость или комментарий, сама запись и версия
+# комментариев новости; сессия после входа уже лежит в кэше.
+COMMENT_WRITE_QUERIES = 4
+
 
 def test_anonymous_user_cant_create_comment(
         client, form_data, new_detail_url):
@@ -24,6 +42,17 @@ def test_auth_user_can_create_comment(
     assert created_comment.text == form_data['text']
 
 
+def test_comment_invalidates_cached_pages(
+        client, author_client, form_data, new_detail_url):
+    """Новый комментарий сбрасывает кэш новости и главной страницы."""
+    home_url = reverse('news:home')
+    client.get(home_url)
+    client.get(new_detail_url)
+    author_client.post(new_detail_url, data=form_data)
+    assert form_data['text'] in client.get(new_detail_url).content.decode()
+    assert 'Комментариев: 1' in client.get(home_url).content.decode()
+
+
 def test_user_cant_use_bad_words(author_client, new_detail_url):
     """Комментарий не содержит запрещённые слова."""
     comments_before_changes = comment_counter()
@@ -38,6 +67,44 @@ def test_user_cant_use_bad_words(author_client, new_detail_url):
     assert comment_counter() == comments_before_changes
 
 
+def test_user_cant_use_banned_terms(author_client, new_detail_url):
+    """Слова из BannedTerm запрещены сразу после добавления."""
+    author_client.post(new_detail_url, data={'text': 'Первый комментарий'})
+    BannedTerm.objects.create(term='Вредитель')
+    comments_before_changes = comment_counter()
+    response = author_client.post(
+        new_detail_url, data={'text': 'Ты вредитель!'}
+    )
+    assertFormError(response, form='form', field='text', errors=WARNING)
+    assert comment_counter() == comments_before_changes
+
+
+def test_banned_terms_rebuilt_only_after_change(settings):
+    """Другой процесс видит правку BannedTerm и без неё не пересобирает."""
+    settings.BANNED_TERMS_CHECK_INTERVAL = 0
+    other_process = BannedTermsCache(())
+    matcher = other_process.get_matcher()
+    assert other_process.get_matcher() is matcher
+    BannedTerm.objects.create(term='Вредитель')
+    assert other_process.get_matcher().search('Ты вредитель!')
+
+
+def test_term_matcher_finds_terms():
+    """Запрещённые слова ищутся как подстроки без учёта регистра."""
+    matcher = TermMatcher(('редис', 'редиска', 'негодяй'))
+    assert matcher.find('Ты РЕДИСКА и негодяйка!') == {
+        'редис', 'редиска', 'негодяй'
+    }
+    assert not matcher.search('Обычный комментарий.')
+
+
+def test_term_matcher_finds_overlapping_terms():
+    """Находятся и слова, пересекающиеся с другими совпадениями."""
+    matcher = TermMatcher(('редиска', 'иск'))
+    assert matcher.find('редиска') == {'редиска', 'иск'}
+    assert TermMatcher(('аба',)).find('абаба') == {'аба'}
+
+
 def test_author_can_delete_comment(
         author_client, comment_delete_url, url_to_comments):
     """Пользователь может удалить свой комментарий."""
@@ -70,6 +137,15 @@ def test_author_can_edit_comment(
     assert changed_comment.text == form_data_for_edit['text']
 
 
+def test_edit_changes_cached_comments(
+        author_client, comment_edit_url, form_data_for_edit, new_detail_url):
+    """После редактирования в кэше фрагмента новый текст комментария."""
+    author_client.get(new_detail_url)
+    author_client.post(comment_edit_url, data=form_data_for_edit)
+    response = author_client.get(new_detail_url)
+    assert form_data_for_edit['text'] in response.content.decode()
+
+
 def test_user_cant_edit_comment_of_another_user(
         author,
         not_author_client,
@@ -82,3 +158,183 @@ def test_user_cant_edit_comment_of_another_user(
     assert response.status_code == HTTPStatus.NOT_FOUND
     changed_comment = Comment.objects.get(pk=author.id)
     assert changed_comment.text == form_data['text']
+
+
+@pytest.mark.parametrize(
+    'url, data',
+    (
+        (
+            pytest.lazy_fixture('new_detail_url'),
+            pytest.lazy_fixture('form_data')
+        ),
+        (
+            pytest.lazy_fixture('comment_edit_url'),
+            pytest.lazy_fixture('form_data_for_edit')
+        ),
+        (pytest.lazy_fixture('comment_delete_url'), None),
+    ),
+)
+def test_comment_write_query_count(
+        author_client, django_assert_num_queries, url, data):
+    """Создание, редактирование и удаление комментария
+    укладываются в фиксированное число запросов.
+    """
+    banned_terms.get_matcher()
+    with django_assert_num_queries(COMMENT_WRITE_QUERIES):
+        response = author_client.post(url, data=data)
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def test_comment_edit_bumps_version_in_db(comment, new):
+    """Версия комментариев хранится в базе и видна всем процессам."""
+    version = News.objects.get(pk=new.pk).comments_version
+    comment.text = 'Новый текст'
+    comment.save()
+    assert News.objects.get(pk=new.pk).comments_version == version + 1
+
+
+def test_moderation_hides_author_comments(
+        client, author, not_author, comment, new, new_detail_url):
+    """Команда скрывает комментарии автора и сбрасывает кэш страниц."""
+    other_comment = Comment.objects.create(
+        news=new, author=not_author, text='Другой комментарий'
+    )
+    assert comment.text in client.get(new_detail_url).content.decode()
+    call_command(
+        'moderate_comments', author=author.username, stdout=StringIO()
+    )
+    content = client.get(new_detail_url).content.decode()
+    assert comment.text not in content
+    assert other_comment.text in content
+    assert comment_counter() == 2
+    home = client.get(reverse('news:home'))
+    assert home.context['object_list'].get().comment_count == 1
+
+
+def test_moderation_deletes_banned_comments(author, new):
+    """Удаляются пачками только комментарии с запрещёнными словами."""
+    Comment.objects.bulk_create(
+        Comment(
+            news=new,
+            author=author,
+            text=f'Ты {BAD_WORDS[0]}' if index % 3 == 0 else 'Спасибо',
+        )
+        for index in range(9)
+    )
+    call_command(
+        'moderate_comments', banned=True, delete=True, chunk_size=2,
+        stdout=StringIO()
+    )
+    assert set(Comment.objects.values_list('text', flat=True)) == {'Спасибо'}
+    assert comment_counter() == 6
+
+
+def test_admin_hide_comments_action(admin_client, comment):
+    """Действие админки скрывает выбранные комментарии."""
+    admin_client.post(reverse('admin:news_comment_changelist'), {
+        'action': 'hide_comments',
+        '_selected_action': [comment.pk],
+    })
+    comment.refresh_from_db()
+    assert comment.hidden
+
+
+def test_admin_delete_marks_news_deleted(
+        admin_client, client, comment, new, new_detail_url):
+    """Удаление в админке только помечает новость, комментарии остаются."""
+    admin_client.post(
+        reverse('admin:news_news_delete', args=(new.pk,)), {'post': 'yes'}
+    )
+    for url in (new_detail_url, reverse('news:comments', args=(new.pk,))):
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert News.all_objects.get(pk=new.pk).deleted
+    assert comment_counter() == 1
+    response = admin_client.get(
+        reverse('admin:news_news_change', args=(new.pk,))
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_purge_news_deletes_comments_in_chunks(author, new):
+    """Команда purge_news удаляет помеченную новость пачками."""
+    Comment.objects.bulk_create(
+        Comment(news=new, author=author, text=f'Текст {index}')
+        for index in range(5)
+    )
+    News.objects.filter(pk=new.pk).update(deleted=True)
+    output = StringIO()
+    call_command('purge_news', chunk_size=2, verbosity=2, stdout=output)
+    assert comment_counter() == 0
+    assert not News.all_objects.exists()
+    assert output.getvalue().count('удалено комментариев') == 3
+
+
+def test_view_queries_use_indexes():
+    """Запросы представлений не сканируют таблицы целиком."""
+    call_command('check_query_plans')
+
+
+def test_sqlite_pragmas_applied(settings):
+    """PRAGMA из настроек выполняются для соединения с SQLite."""
+    settings.SQLITE_PRAGMAS = {'cache_size': -4000, 'busy_timeout': 1234}
+    apply_sqlite_pragmas(connection)
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA cache_size')
+        assert cursor.fetchone() == (-4000,)
+        cursor.execute('PRAGMA busy_timeout')
+        assert cursor.fetchone() == (1234,)
+
+
+def test_seed_creates_rows_with_dates():
+    """Команда seed создаёт записи пачками с датами после даты новости."""
+    call_command(
+        'seed', users=3, news=5, comments=50, batch_size=7, verbosity=0
+    )
+    assert News.objects.count() == 5
+    assert comment_counter() == 50
+    for comment in Comment.objects.select_related('news'):
+        assert timezone.localtime(comment.created).date() >= comment.news.date
+
+
+@pytest.mark.parametrize('counts', ({'news': 0}, {'users': 0}))
+def test_seed_rejects_comments_without_news_or_users(counts):
+    """Комментарии без новостей или пользователей — ошибка команды."""
+    with pytest.raises(CommandError):
+        call_command('seed', comments=10, verbosity=0, **counts)
+    assert News.objects.count() == 0
+
+
+def test_seed_comment_counts_have_long_tail():
+    """Комментарии по новостям распределены с длинным хвостом."""
+    counts = sorted(get_comment_counts(random.Random(0), 1000, 20_000))
+    median = counts[len(counts) // 2]
+    assert sum(counts) == 20_000
+    assert median < 20
+    assert counts[-1] > 10 * median
+
+
+def test_loadtest_report():
+    """Отчёт нагрузочного теста считает запросы и ошибки по страницам."""
+    samples = [('home', 10, True), ('home', 30, True), ('detail', 5, False)]
+    report = summarize_samples(samples, duration=2)
+    assert report['requests'] == 3
+    assert report['rps'] == 1.5
+    assert report['errors'] == 1
+    assert report['endpoints']['home']['requests'] == 2
+    assert report['endpoints']['detail']['errors'] == 1
+
+
+def test_cached_user_reset_on_password_change_and_logout(
+        author, author_client, new_detail_url):
+    """Пользователь пропадает из кэша при смене пароля и при выходе."""
+    key = USER_KEY.format(pk=author.pk)
+    author_client.get(new_detail_url)
+    assert cache.get(key) == author
+    author.set_password('новый пароль')
+    author.save()
+    assert cache.get(key) is None
+    author_client.force_login(author)
+    author_client.get(new_detail_url)
+    assert cache.get(key) == author
+    author_client.logout()
+    assert cache.get(key) is None
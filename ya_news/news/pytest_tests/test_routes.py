@@ -10,6 +10,7 @@ from pytest_django.asserts import assertRedirects
     (
         ('news:home', None),
         ('news:detail', pytest.lazy_fixture('new_id_for_args')),
+        ('news:comments', pytest.lazy_fixture('new_id_for_args')),
         ('users:login', None),
         ('users:logout', None),
         ('users:signup', None),
@@ -17,7 +18,7 @@ from pytest_django.asserts import assertRedirects
 )
 def test_pages_availability_for_guests(client, name, args):
     """Анонимный пользователь имеет доступ к главной странице,
-    странице отдельной новости и страницам регистрации.
+    странице отдельной новости, её комментариям и страницам регистрации.
     """
     url = reverse(name, args=args)
     response = client.get(url)
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .auth import invalidate_cached_user
+from .cache import bump_comments_version, invalidate_news_pages
+from .db import apply_sqlite_pragmas
+from .forms import banned_terms
+from .models import BannedTerm, Comment, News
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    bump_comments_version(instance.news_id)
+    invalidate_news_pages(instance.news_id)
+
+
+@receiver((post_save, post_delete), sender=News)
+def invalidate_news(sender, instance, **kwargs):
+    invalidate_news_pages(instance.pk)
+
+
+@receiver((post_save, post_delete), sender=BannedTerm)
+def invalidate_banned_terms(sender, instance, **kwargs):
+    banned_terms.invalidate()
+
+
+@receiver((post_save, post_delete), sender=settings.AUTH_USER_MODEL)
+def invalidate_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_cached_user(user.pk)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    apply_sqlite_pragmas(connection)
@@ -1,12 +1,25 @@
+from django.conf import settings
 from django.urls import path
 
-from news import views
+from news import async_views, views
 
 app_name = 'news'
 
+if settings.ASYNC_READ_VIEWS:
+    home_view = async_views.news_list
+    detail_view = async_views.news_detail
+else:
+    home_view = views.NewsList.as_view()
+    detail_view = views.NewsDetailView.as_view()
+
 urlpatterns = [
-    path('', views.NewsList.as_view(), name='home'),
-    path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path('', home_view, name='home'),
+    path('news/<int:pk>/', detail_view, name='detail'),
+    path(
+        'news/<int:pk>/comments/',
+        views.NewsCommentsPage.as_view(),
+        name='comments'
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
@@ -1,38 +1,137 @@
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import BadRequest
+from django.db.models import Count, Max, Q
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.views import generic
 
+from .cache import (
+    DETAIL_PAGE_KEY, HOME_PAGE_KEY, AnonymousPageCacheMixin,
+    ConditionalGetMixin
+)
 from .forms import CommentForm
 from .models import Comment, News
+from .pagination import get_comments_page
 
 
-class NewsList(generic.ListView):
+def with_comment_activity(news):
+    """Число видимых комментариев и время последнего из них."""
+    visible = Q(comment__hidden=False)
+    return news.annotate(
+        comment_count=Count('comment', filter=visible),
+        last_comment=Max('comment__created', filter=visible),
+    )
+
+
+class NewsList(
+        AnonymousPageCacheMixin,
+        ConditionalGetMixin,
+        generic.ListView
+):
     """Список новостей."""
     model = News
     template_name = 'news/home.html'
 
+    def get_page_cache_key(self):
+        return HOME_PAGE_KEY
+
     def get_queryset(self):
         """
         Выводим только несколько последних новостей.
 
-        Их количество определяется в настройках проекта.
+        Их количество определяется в настройках проекта,
+        число комментариев считается в том же запросе
+        и только для этих новостей.
+        """
+        latest_news = self.model.objects.values('pk')[
+            :settings.NEWS_COUNT_ON_HOME_PAGE
+        ]
+        return with_comment_activity(
+            self.model.objects.filter(pk__in=latest_news)
+        )
+
+    def get_page_state(self):
+        """
+        Новости главной страницы, их комментарии и время последнего.
+
+        Если список уже получен для рендеринга, второй запрос не нужен.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        news_list = getattr(self, 'object_list', None)
+        if news_list is None:
+            news_list = self.get_queryset()
+        return sorted(
+            (
+                news.pk, news.title, news.text, news.date,
+                news.comment_count, news.last_comment,
+            )
+            for news in news_list
+        )
+
+
+class CommentsPageMixin:
+    """
+    Добавляет в контекст страницу комментариев к новости.
+
+    Список комментариев кэшируется фрагментом шаблона по версии
+    комментариев новости. Пользователю, у которого на странице есть
+    свои комментарии, достаётся отдельный фрагмент со ссылками
+    на редактирование и удаление, остальные получают общий.
+    """
+
+    def get_cursor(self):
+        return None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        news_id = self.kwargs['pk']
+        cursor = self.get_cursor()
+        try:
+            comments, next_cursor = get_comments_page(news_id, cursor)
+        except ValueError as error:
+            raise BadRequest(error)
+        user = self.request.user
+        has_own_comments = user.is_authenticated and any(
+            comment.author_id == user.pk for comment in comments
+        )
+        context.update(
+            news_id=news_id,
+            comments=comments,
+            cursor=cursor or '',
+            next_cursor=next_cursor,
+            comments_version=self.object.comments_version,
+            comments_owner=user.pk if has_own_comments else '',
+            comments_cache_timeout=settings.COMMENTS_CACHE_TIMEOUT,
+        )
+        return context
 
 
-class NewsDetail(generic.DetailView):
+class NewsDetail(
+        AnonymousPageCacheMixin,
+        ConditionalGetMixin,
+        CommentsPageMixin,
+        generic.DetailView
+):
     model = News
     template_name = 'news/detail.html'
 
+    def get_page_cache_key(self):
+        return DETAIL_PAGE_KEY.format(pk=self.kwargs['pk'])
+
+    def get_page_state(self):
+        """
+        Новость, число комментариев, время последнего из них
+        и версия комментариев, которая меняется и при их правке.
+        """
+        return with_comment_activity(
+            self.model.objects.filter(pk=self.kwargs['pk'])
+        ).values_list(
+            'title', 'text', 'date', 'comment_count', 'last_comment',
+            'comments_version',
+        ).first()
+
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
+        obj = get_object_or_404(self.model.objects, pk=self.kwargs['pk'])
         return obj
 
     def get_context_data(self, **kwargs):
@@ -44,6 +143,7 @@ class NewsDetail(generic.DetailView):
 
 class NewsComment(
         LoginRequiredMixin,
+        CommentsPageMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
@@ -51,6 +151,9 @@ class NewsComment(
     form_class = CommentForm
     template_name = 'news/detail.html'
 
+    def get_queryset(self):
+        return self.model.objects.all()
+
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
         return super().post(request, *args, **kwargs)
@@ -63,19 +166,37 @@ class NewsComment(
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
+    """Страница новости: просмотр и добавление комментария."""
+    # Представления собираются один раз при импорте модуля,
+    # а не заново на каждый запрос.
+    detail_view = staticmethod(NewsDetail.as_view())
+    comment_view = staticmethod(NewsComment.as_view())
 
     def get(self, request, *args, **kwargs):
-        view = NewsDetail.as_view()
-        return view(request, *args, **kwargs)
+        return self.detail_view(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
-        view = NewsComment.as_view()
-        return view(request, *args, **kwargs)
+        return self.comment_view(request, *args, **kwargs)
+
+
+class NewsCommentsPage(CommentsPageMixin, generic.TemplateView):
+    """Следующая страница комментариев для кнопки «Показать ещё»."""
+    template_name = 'news/includes/comments.html'
+
+    def get(self, request, *args, **kwargs):
+        self.object = get_object_or_404(
+            News.objects.only('comments_version'), pk=self.kwargs['pk']
+        )
+        return super().get(request, *args, **kwargs)
+
+    def get_cursor(self):
+        return self.request.GET.get('after')
 
 
 class CommentBase(LoginRequiredMixin):
@@ -83,9 +204,8 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
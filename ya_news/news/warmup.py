@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+
+
+def iter_template_names(directory):
+    for path in sorted(Path(directory).rglob('*.html')):
+        yield path.relative_to(directory).as_posix()
+
+
+def warm_up_templates():
+    """
+    Компилирует все шаблоны из каталогов DIRS.
+
+    С кэширующим загрузчиком скомпилированные шаблоны остаются
+    в памяти процесса, и первый запрос не тратит время на разбор.
+    Возвращает число шаблонов.
+    """
+    compiled = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for directory in backend.engine.dirs:
+            for name in iter_template_names(directory):
+                backend.engine.get_template(name)
+                compiled += 1
+    return compiled
@@ -21,6 +21,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'news.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -48,6 +49,9 @@ TEMPLATES = [
     },
 ]
 
+# Компилировать все шаблоны при запуске (news.warmup).
+TEMPLATES_WARM_UP = False
+
 WSGI_APPLICATION = 'yanews.wsgi.application'
 
 
@@ -58,6 +62,29 @@ DATABASES = {
     }
 }
 
+# PRAGMA, которые выполняются при каждом подключении к SQLite.
+SQLITE_PRAGMAS = {}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yanews',
+        'OPTIONS': {
+            # При переполнении LocMemCache вытесняет давно не читанные записи.
+            'MAX_ENTRIES': 1000,
+        },
+    }
+}
+
+
+# Сессия читается из кэша, в базу запрос идёт только при промахе.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = ['news.auth.CachedModelBackend']
+
+# Сколько секунд пользователь сессии хранится в кэше.
+USER_CACHE_TIMEOUT = 60
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -80,3 +107,29 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_PAGE_SIZE = 50
+
+# Сколько последних комментариев показывать на странице новости в админке.
+ADMIN_NEWS_COMMENTS = 20
+
+# Страницы для анонимных пользователей кэшируются в каждом процессе
+# отдельно: правку из другого процесса они покажут не позже этого срока.
+NEWS_PAGE_CACHE_TIMEOUT = 60 * 5
+
+COMMENTS_CACHE_TIMEOUT = 60 * 60
+
+# Как часто, в секундах, процесс сверяет версию списка BannedTerm с базой.
+BANNED_TERMS_CHECK_INTERVAL = 5
+
+# Сколько комментариев скрывается или удаляется одним запросом.
+MODERATION_CHUNK_SIZE = 500
+
+# Асинхронные страницы для чтения (news.async_views) при запуске под ASGI.
+ASYNC_READ_VIEWS = False
+
+# Замеры запросов: Server-Timing и сводка командой request_metrics.
+REQUEST_METRICS_ENABLED = False
+REQUEST_METRICS_WINDOW = 1000
+REQUEST_METRICS_DIR = BASE_DIR / 'request_metrics'
+REQUEST_METRICS_FLUSH_INTERVAL = 10
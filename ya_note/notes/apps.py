@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class NotesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'notes'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        if settings.TEMPLATES_WARM_UP:
+            from .warmup import warm_up_templates
+            warm_up_templates()
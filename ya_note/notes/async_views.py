@@ -0,0 +1,35 @@
+"""
+Асинхронные варианты страниц для чтения, для запуска под ASGI.
+
+Включаются настройкой ASYNC_READ_VIEWS. В Django 3.2 ORM синхронный,
+поэтому проверка пользователя, запросы к базе и рендеринг шаблона
+выполняются одним вызовом sync_to_async, а не двумя, как у синхронного
+представления под ASGI.
+"""
+from asgiref.sync import sync_to_async
+
+from .views import NoteDetail, NotesList
+
+notes_list_view = NotesList.as_view()
+note_detail_view = NoteDetail.as_view()
+
+
+def render_view(view, request, **kwargs):
+    """Вызывает синхронное представление и сразу рендерит ответ."""
+    response = view(request, **kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+render_in_thread = sync_to_async(render_view, thread_sensitive=True)
+
+
+async def notes_list(request):
+    """Список всех заметок пользователя."""
+    return await render_in_thread(notes_list_view, request)
+
+
+async def note_detail(request, slug):
+    """Заметка подробно."""
+    return await render_in_thread(note_detail_view, request, slug=slug)
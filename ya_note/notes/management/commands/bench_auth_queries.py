@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+
+CONFIGURATIONS = {
+    'сессии в базе, пользователь из базы': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'AUTHENTICATION_BACKENDS': [
+            'django.contrib.auth.backends.ModelBackend'
+        ],
+    },
+    'сессии cached_db, пользователь из кэша': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'AUTHENTICATION_BACKENDS': ['notes.auth.CachedModelBackend'],
+    },
+    'сессии в подписанной cookie, пользователь из кэша': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.signed_cookies',
+        'AUTHENTICATION_BACKENDS': ['notes.auth.CachedModelBackend'],
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Считает запросы к базе на одну страницу notes:list '
+        'для авторизованного пользователя при разных настройках '
+        'сессий и аутентификации. '
+        'Данные создаются в транзакции и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=10)
+
+    def count_queries(self, client, url, count):
+        # Первый запрос прогревает кэши и в замер не входит.
+        client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            for _ in range(count):
+                client.get(url)
+        return context.captured_queries
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        with transaction.atomic():
+            user = get_user_model().objects.create(username='bench')
+            for index in range(10):
+                Note.objects.create(
+                    title=f'Заметка {index}', text='Текст', author=user
+                )
+            url = reverse('notes:list')
+            for name, overrides in CONFIGURATIONS.items():
+                with override_settings(**overrides):
+                    client = Client(HTTP_HOST='localhost')
+                    client.force_login(user)
+                    queries = self.count_queries(client, url, count)
+                self.stdout.write(
+                    f'{name}: запросов к базе на страницу '
+                    f'{len(queries) / count:.0f}'
+                )
+                if options['verbosity'] > 1:
+                    for query in queries[:len(queries) // count]:
+                        self.stdout.write(f'    {query["sql"]}')
+            transaction.set_rollback(True)
@@ -0,0 +1,82 @@
+import tracemalloc
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.views import generic
+
+from notes.models import Note
+from notes.views import NoteBase, NotesList
+
+
+class LegacyNotesList(NoteBase, generic.ListView):
+    """Прежний список: все заметки пользователя со всеми полями."""
+    template_name = 'notes/list.html'
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт заметки одного автора и сравнивает время и пиковую '
+        'память страницы списка заметок: прежний полный список против '
+        'постраничного. Данные создаются в транзакции и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--notes', type=int, default=100_000)
+        parser.add_argument('--text-length', type=int, default=2_000)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def seed(self, author, count, text, batch_size):
+        for start in range(0, count, batch_size):
+            Note.objects.bulk_create(
+                Note(
+                    title=f'Заметка {index}',
+                    text=text,
+                    slug=f'bench-{index}',
+                    author=author,
+                )
+                for index in range(start, min(start + batch_size, count))
+            )
+
+    def render(self, view, request):
+        response = view(request)
+        response.render()
+        return response
+
+    def measure(self, view, request, repeat):
+        start = perf_counter()
+        for _ in range(repeat):
+            self.render(view, request)
+        latency = (perf_counter() - start) / repeat
+        tracemalloc.start()
+        self.render(view, request)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return latency, peak
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            author = get_user_model().objects.create(username='bench')
+            self.seed(
+                author,
+                options['notes'],
+                'x' * options['text_length'],
+                options['batch_size'],
+            )
+            request = RequestFactory().get('/notes/')
+            request.user = author
+            for name, view_class in (
+                ('полный список', LegacyNotesList),
+                ('постранично', NotesList),
+            ):
+                latency, peak = self.measure(
+                    view_class.as_view(), request, options['repeat']
+                )
+                self.stdout.write(
+                    f'{name}: {latency * 1000:.1f} мс, '
+                    f'пик памяти {peak / 2 ** 20:.1f} МБ'
+                )
+            transaction.set_rollback(True)
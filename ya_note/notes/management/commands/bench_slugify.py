@@ -0,0 +1,44 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from pytils.translit import slugify
+
+from notes.slugs import cached_slugify
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время транслитерации заголовков при массовом импорте '
+        'с повторяющимися заголовками: без кэша и с кэшем cached_slugify. '
+        'Печатает статистику попаданий кэша.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument(
+            '--distinct', type=int, default=1_000,
+            help='Сколько разных заголовков среди строк импорта.'
+        )
+
+    def measure(self, function, titles):
+        start = perf_counter()
+        for title in titles:
+            function(title)
+        return perf_counter() - start
+
+    def handle(self, *args, **options):
+        titles = [
+            f'Список покупок на неделю №{index % options["distinct"]}'
+            for index in range(options['rows'])
+        ]
+        cached_slugify.cache_clear()
+        for name, function in (
+            ('без кэша', slugify),
+            ('с кэшем', cached_slugify),
+        ):
+            elapsed = self.measure(function, titles)
+            self.stdout.write(
+                f'{name}: {elapsed * 1000:.1f} мс, '
+                f'{len(titles) / elapsed:.0f} заголовков/с'
+            )
+        self.stdout.write(str(cached_slugify.cache_info()))
@@ -0,0 +1,73 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+
+from notes import views
+from notes.models import Note
+from notes.slugs import similar_slugs
+
+# Строка плана SQLite вида «SCAN notes_note» без «USING INDEX»
+# означает полный проход по таблице.
+FULL_SCAN = re.compile(r'\bSCAN (?:TABLE )?\w+$')
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет EXPLAIN QUERY PLAN для запросов представлений '
+        'и завершается ошибкой, если какой-то из них сканирует '
+        'таблицу целиком.'
+    )
+
+    def get_view(self, view_class, **kwargs):
+        request = RequestFactory().get('/')
+        request.user = get_user_model()(pk=1)
+        view = view_class()
+        view.setup(request, **kwargs)
+        return view
+
+    def get_querysets(self):
+        """Запросы представлений с произвольными значениями параметров."""
+        slug = 'slug'
+        slug_length = Note._meta.get_field('slug').max_length
+        querysets = [
+            ('notes:list', self.get_view(views.NotesList).get_queryset()),
+            ('notes:add slug', Note.objects.filter(slug=slug).exclude(id=1)),
+            (
+                'notes:add auto slug',
+                Note.objects.filter(
+                    similar_slugs(slug, slug_length)
+                ).exclude(id=1)
+            ),
+        ]
+        for name, view_class in (
+            ('notes:detail', views.NoteDetail),
+            ('notes:edit', views.NoteUpdate),
+            ('notes:delete', views.NoteDelete),
+        ):
+            view = self.get_view(view_class, slug=slug)
+            querysets.append((name, view.get_queryset().filter(slug=slug)))
+        return querysets
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Проверка планов поддерживается только SQLite.')
+        full_scans = []
+        for name, queryset in self.get_querysets():
+            plan = queryset.explain()
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{name}:\n{plan}')
+            full_scans += [
+                f'{name}: {line}'
+                for line in plan.splitlines()
+                if FULL_SCAN.search(line)
+            ]
+        if full_scans:
+            raise CommandError(
+                'Запросы сканируют таблицы целиком:\n' + '\n'.join(full_scans)
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'Полных сканирований таблиц не обнаружено.'
+        ))
@@ -0,0 +1,56 @@
+import json
+import sys
+from contextlib import nullcontext
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from notes.models import Note
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает заметки пользователя (или всех пользователей) '
+        'в формате JSON Lines: по одной заметке в строке.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?', default='-',
+            help='Файл для выгрузки, по умолчанию стандартный вывод.'
+        )
+        parser.add_argument('--author', help='Имя пользователя.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        notes = Note.objects.order_by('pk')
+        if options['author']:
+            notes = notes.filter(author__username=options['author'])
+        rows = notes.values_list(
+            'title', 'text', 'slug', 'author__username'
+        ).iterator(chunk_size=options['chunk_size'])
+        to_stdout = options['output'] == '-'
+        output = (
+            nullcontext(sys.stdout) if to_stdout
+            else open(options['output'], 'w', encoding='utf-8')
+        )
+        start = perf_counter()
+        count = 0
+        with output as file:
+            for title, text, slug, author in rows:
+                file.write(json.dumps(
+                    {
+                        'title': title,
+                        'text': text,
+                        'slug': slug,
+                        'author': author,
+                    },
+                    ensure_ascii=False
+                ) + '\n')
+                count += 1
+        elapsed = perf_counter() - start
+        report = self.stderr if to_stdout else self.stdout
+        report.write(
+            f'Выгружено заметок: {count} за {elapsed:.1f} с '
+            f'({count / max(elapsed, 1e-9):.0f} строк/с)'
+        )
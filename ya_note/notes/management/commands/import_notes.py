@@ -0,0 +1,109 @@
+import json
+import sys
+from contextlib import nullcontext
+from itertools import islice
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from notes.models import Note
+from notes.search import index_notes
+from notes.slugs import base_slug, cached_slugify, pick_free_slug
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает заметки из файла JSON Lines, созданного export_notes. '
+        'Заметки пишутся пачками через bulk_create, совпадающие slug '
+        'получают свободный суффикс.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', nargs='?', default='-',
+            help='Файл с заметками, по умолчанию стандартный ввод.'
+        )
+        parser.add_argument(
+            '--author',
+            help='Записать все заметки на этого пользователя.'
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def get_author_ids(self, usernames):
+        """Возвращает id авторов по именам, по одному запросу на пачку."""
+        missing = usernames - self.author_ids.keys()
+        if missing:
+            self.author_ids.update(
+                get_user_model().objects.filter(
+                    username__in=missing
+                ).values_list('username', 'pk')
+            )
+        unknown = usernames - self.author_ids.keys()
+        if unknown:
+            raise CommandError(
+                'Нет пользователей: ' + ', '.join(sorted(unknown))
+            )
+        return self.author_ids
+
+    def build_notes(self, rows):
+        author_ids = self.get_author_ids({
+            self.author or row['author'] for row in rows
+        })
+        notes = []
+        for row in rows:
+            slug = row.get('slug') or base_slug(
+                row['title'], self.max_slug_length
+            )
+            slug = pick_free_slug(slug, self.taken_slugs, self.max_slug_length)
+            self.taken_slugs.add(slug)
+            notes.append(Note(
+                title=row['title'],
+                text=row['text'],
+                slug=slug,
+                author_id=author_ids[self.author or row['author']],
+            ))
+        return notes
+
+    def save_batch(self, rows):
+        notes = self.build_notes(rows)
+        with transaction.atomic():
+            Note.objects.bulk_create(notes)
+            # bulk_create не вызывает сигналы, индекс поиска
+            # обновляем сами по только что созданным заметкам.
+            index_notes(Note.objects.filter(
+                slug__in=[note.slug for note in notes]
+            ).only('id', 'title', 'text'))
+        return len(notes)
+
+    def handle(self, *args, **options):
+        self.author = options['author']
+        self.author_ids = {}
+        self.max_slug_length = Note._meta.get_field('slug').max_length
+        self.taken_slugs = set(
+            Note.objects.values_list('slug', flat=True).iterator()
+        )
+        from_stdin = options['input'] == '-'
+        source = (
+            nullcontext(sys.stdin) if from_stdin
+            else open(options['input'], encoding='utf-8')
+        )
+        start = perf_counter()
+        count = 0
+        with source as file:
+            rows = (json.loads(line) for line in file if line.strip())
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+                count += self.save_batch(batch)
+        elapsed = perf_counter() - start
+        self.stdout.write(
+            f'Загружено заметок: {count} за {elapsed:.1f} с '
+            f'({count / max(elapsed, 1e-9):.0f} строк/с)'
+        )
+        if options['verbosity'] > 1:
+            self.stdout.write(
+                f'Кэш транслитерации: {cached_slugify.cache_info()}'
+            )
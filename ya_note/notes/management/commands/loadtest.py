@@ -0,0 +1,190 @@
+import json
+import multiprocessing
+import random
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+
+from notes.metrics import percentile
+from notes.models import Note
+
+User = get_user_model()
+
+# Доли запросов в нагрузке.
+SCENARIO_WEIGHTS = {
+    'list': 40,
+    'detail': 25,
+    'add': 15,
+    'edit': 10,
+    'delete': 10,
+}
+
+
+def run_worker(number, user_id, duration, random_seed, results):
+    """Процесс нагрузки: случайные запросы из смеси до конца времени."""
+    connections.close_all()
+    rng = random.Random(random_seed + number)
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(User.objects.get(pk=user_id))
+    slugs = list(
+        Note.objects.filter(author_id=user_id).values_list('slug', flat=True)
+    )
+    list_url = reverse('notes:list')
+    add_url = reverse('notes:add')
+    names = list(SCENARIO_WEIGHTS)
+    weights = list(SCENARIO_WEIGHTS.values())
+    samples = []
+    created = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        if not slugs:
+            name = 'add'
+        slug = rng.choice(slugs) if slugs else None
+        start = perf_counter()
+        if name == 'list':
+            response = client.get(list_url)
+        elif name == 'detail':
+            response = client.get(reverse('notes:detail', args=(slug,)))
+        elif name == 'add':
+            created += 1
+            slug = f'w{number}-{created}'
+            response = client.post(add_url, {
+                'title': 'Новая заметка', 'text': 'Текст', 'slug': slug,
+            })
+            slugs.append(slug)
+        elif name == 'edit':
+            response = client.post(reverse('notes:edit', args=(slug,)), {
+                'title': 'Изменённая заметка', 'text': 'Текст', 'slug': slug,
+            })
+        else:
+            response = client.post(reverse('notes:delete', args=(slug,)))
+            slugs.remove(slug)
+        samples.append((
+            name,
+            (perf_counter() - start) * 1000,
+            response.status_code < 400,
+        ))
+    results.put(samples)
+
+
+def summarize_samples(samples, duration):
+    def latencies(rows):
+        values = [latency for _, latency, _ in rows] or [0]
+        return {
+            'p50': round(percentile(values, 0.5), 2),
+            'p95': round(percentile(values, 0.95), 2),
+            'p99': round(percentile(values, 0.99), 2),
+        }
+
+    by_name = defaultdict(list)
+    for sample in samples:
+        by_name[sample[0]].append(sample)
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / duration, 1),
+        'errors': sum(not ok for _, _, ok in samples),
+        'latency': latencies(samples),
+        'endpoints': {
+            name: {
+                'requests': len(rows),
+                'errors': sum(not ok for _, _, ok in rows),
+                **latencies(rows),
+            }
+            for name, rows in sorted(by_name.items())
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест YaNote: создаёт отдельную базу, наполняет её '
+        'заметками пользователей, запускает процессы со смесью запросов '
+        '(список, заметка, создание, изменение, удаление) и выводит '
+        'задержки p50/p95/p99 и число запросов в секунду в формате JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument(
+            '--notes', type=int, default=200,
+            help='Число заметок у каждого пользователя.'
+        )
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=30)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Файл для отчёта JSON.')
+
+    def run_workers(self, options):
+        user_ids = list(User.objects.values_list('pk', flat=True))
+        # Дочерние процессы открывают свои соединения с базой.
+        connections.close_all()
+        # Процессы наследуют настроенный Django и подключение к временной
+        # базе, поэтому нужен fork: при spawn и forkserver они запустились
+        # бы заново с базой из настроек.
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        processes = [
+            context.Process(target=run_worker, args=(
+                number, user_ids[number % len(user_ids)],
+                options['duration'], options['seed'], results
+            ))
+            for number in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        samples = []
+        for _ in processes:
+            samples += results.get()
+        for process in processes:
+            process.join()
+        return samples
+
+    def handle(self, *args, **options):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError(
+                'Нагрузочному тесту нужен запуск процессов через fork.'
+            )
+        old_name = connection.settings_dict['NAME']
+        with tempfile.TemporaryDirectory() as directory:
+            connection.settings_dict['TEST']['NAME'] = str(
+                Path(directory) / 'loadtest.sqlite3'
+            )
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                call_command(
+                    'seed',
+                    users=options['users'],
+                    notes=options['notes'],
+                    seed=options['seed'],
+                    verbosity=0,
+                )
+                samples = self.run_workers(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+        report = {
+            'project': 'yanote',
+            'workers': options['workers'],
+            'duration': options['duration'],
+            'data': {
+                'users': options['users'],
+                'notes': options['users'] * options['notes'],
+            },
+            **summarize_samples(samples, options['duration']),
+        }
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(output, encoding='utf-8')
+        else:
+            self.stdout.write(output)
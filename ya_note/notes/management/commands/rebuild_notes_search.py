@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from notes.models import Note
+from notes.search import clear_index, index_notes, is_search_supported
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает полнотекстовый индекс заметок пачками '
+        'по --batch-size заметок, каждая в своей транзакции.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not is_search_supported():
+            raise CommandError(
+                'Поиск по заметкам поддерживается только SQLite.'
+            )
+        batch_size = options['batch_size']
+        clear_index()
+        indexed = 0
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    Note.objects.filter(pk__gt=last_pk)
+                    .only('id', 'title', 'text')
+                    .order_by('pk')[:batch_size]
+                )
+                if not batch:
+                    break
+                index_notes(batch)
+            last_pk = batch[-1].pk
+            indexed += len(batch)
+            self.stdout.write(f'Проиндексировано заметок: {indexed}')
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен.'))
@@ -0,0 +1,38 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notes.metrics import summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит в формате JSON сводку замеров RequestMetricsMiddleware '
+        'по именам URL, объединяя файлы всех процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Удалить сохранённые замеры после вывода.'
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(settings.REQUEST_METRICS_DIR)
+        paths = sorted(directory.glob('*.json')) if directory.is_dir() else []
+        samples = defaultdict(list)
+        for path in paths:
+            for url_name, url_samples in json.loads(path.read_text()).items():
+                samples[url_name].extend(url_samples)
+        report = {
+            url_name: summarize(url_samples)
+            for url_name, url_samples in sorted(samples.items())
+        }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+        if options['clear']:
+            for path in paths:
+                path.unlink()
@@ -0,0 +1,124 @@
+import random
+import secrets
+from itertools import islice
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import reset_queries, transaction
+
+from notes.models import Note
+from notes.search import index_notes
+from notes.slugs import cached_slugify
+
+User = get_user_model()
+
+WORDS = (
+    'покупки', 'дела', 'идеи', 'книги', 'фильмы', 'рецепты', 'поездка',
+    'работа', 'учёба', 'спорт', 'подарки', 'ремонт', 'встречи', 'сад',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу пользователями и их заметками с уникальными slug. '
+        'Записи создаются генераторами и сохраняются пачками bulk_create, '
+        'поэтому память не растёт с числом строк.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument(
+            '--notes', type=int, default=1_000,
+            help='Число заметок у каждого пользователя.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--seed', type=int, help='Зерно генератора.')
+
+    def generate_users(self, count):
+        for index in range(count):
+            yield User(username=f'seed-{self.prefix}-{index}')
+
+    def generate_notes(self, user_ids, per_user):
+        number = 0
+        for author_id in user_ids:
+            for _ in range(per_user):
+                number += 1
+                title = ' '.join(self.rng.sample(WORDS, 2)).capitalize()
+                yield Note(
+                    title=title,
+                    text=f'{title}: не забыть. ' * 10,
+                    # Приставка запуска и номер делают slug уникальным.
+                    slug=f'{cached_slugify(title)}-{self.prefix}-{number}',
+                    author_id=author_id,
+                )
+
+    def save_users(self, users):
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+
+    def save_notes(self, notes):
+        """Сохраняет пачку заметок и добавляет её в индекс поиска."""
+        with transaction.atomic():
+            Note.objects.bulk_create(notes)
+            # В SQLite bulk_create не возвращает id: новые заметки —
+            # это заметки с id больше прежнего максимального.
+            index_notes(
+                Note.objects.filter(pk__gt=self.last_note_pk)
+                .only('id', 'title', 'text').order_by('pk')
+            )
+        self.last_note_pk = Note.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first()
+
+    def save_in_batches(self, name, objects, save):
+        start = perf_counter()
+        count = 0
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            save(batch)
+            # При DEBUG = True Django хранит текст каждого запроса.
+            reset_queries()
+            count += len(batch)
+        if self.verbosity >= 1:
+            elapsed = perf_counter() - start
+            self.stdout.write(
+                f'{name}: {count} за {elapsed:.1f} с '
+                f'({count / max(elapsed, 1e-9):.0f} строк/с)'
+            )
+
+    def check_options(self, options):
+        for name in ('users', 'notes'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} не может быть меньше нуля.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должно быть больше нуля.')
+
+    def handle(self, *args, **options):
+        self.check_options(options)
+        self.rng = random.Random(options['seed'])
+        self.verbosity = options['verbosity']
+        self.batch_size = options['batch_size']
+        # Приставка отделяет записи этого запуска от прежних.
+        self.prefix = secrets.token_hex(3)
+        last_user_pk = User.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        self.last_note_pk = Note.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        self.save_in_batches(
+            'Пользователи',
+            self.generate_users(options['users']),
+            self.save_users
+        )
+        user_ids = list(User.objects.filter(
+            pk__gt=last_user_pk
+        ).values_list('pk', flat=True))
+        self.save_in_batches(
+            'Заметки',
+            self.generate_notes(user_ids, options['notes']),
+            self.save_notes
+        )
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+FTS_TABLE = 'notes_note_fts'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, text)'
+    )
+    schema_editor.execute(
+        f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+        f'SELECT id, title, text FROM notes_note'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
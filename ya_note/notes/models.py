@@ -1,7 +1,11 @@
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
 
-from pytils.translit import slugify
+from .slugs import allocate_slug
+
+# Сколько раз пробуем подобрать slug, если его успел занять
+# параллельный запрос.
+SLUG_ATTEMPTS = 5
 
 
 class Note(models.Model):
@@ -26,13 +30,33 @@ class Note(models.Model):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        # Поиск по автору обслуживает составной индекс из Meta.
+        db_index=False,
     )
 
+    class Meta:
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_idx'),
+        )
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        """
+        Без явного slug подбираем свободный по заголовку.
+
+        Сохранение идёт в точке сохранения транзакции: если параллельный
+        запрос занял тот же slug, подбираем следующий свободный.
+        """
+        if self.slug:
+            return super().save(*args, **kwargs)
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug = allocate_slug(Note, self.title, self.pk)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == SLUG_ATTEMPTS - 1:
+                    self.slug = ''
+                    raise
@@ -0,0 +1,100 @@
+from unicodedata import category
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Note
+
+FTS_TABLE = 'notes_note_fts'
+# Границы найденных слов во фрагменте: символы, которых нет в тексте,
+# чтобы экранировать фрагмент целиком и только потом выделить слова.
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_TOKENS = 12
+
+
+def is_search_supported():
+    """Полнотекстовый индекс FTS5 есть только в SQLite."""
+    return connection.vendor == 'sqlite'
+
+
+def index_notes(notes):
+    """Добавляет заметки в индекс или обновляет их там."""
+    if not is_search_supported():
+        return
+    rows = [(note.pk, note.title, note.text) for note in notes]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(pk,) for pk, _, _ in rows]
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            f'VALUES (%s, %s, %s)',
+            rows
+        )
+
+
+def unindex_note(note_id):
+    if not is_search_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', (note_id,))
+
+
+def clear_index():
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+
+def build_match_query(query):
+    """
+    Запрос FTS5 из слов пользователя.
+
+    Каждое слово берётся в кавычки, чтобы FTS5 не разбирал его как свой
+    синтаксис, и ищется как префикс: «покуп» найдёт «покупок».
+    Управляющие символы выбрасываются: на NUL FTS5 обрывает строку.
+    """
+    words = (
+        ''.join(char for char in word if category(char)[0] != 'C')
+        for word in query.split()
+    )
+    return ' '.join(
+        '"{}"*'.format(word.replace('"', '""')) for word in words if word
+    )
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(SNIPPET_START, '<mark>')
+        .replace(SNIPPET_END, '</mark>')
+    )
+
+
+def search_notes(author, query, limit):
+    """
+    Заметки автора, подходящие под запрос, от самых релевантных.
+
+    У каждой заметки есть атрибут snippet — фрагмент текста
+    с выделенными найденными словами.
+    """
+    match_query = build_match_query(query)
+    if not match_query or not is_search_supported():
+        return []
+    notes = list(Note.objects.raw(
+        f'SELECT note.id, note.title, note.slug, '
+        f'snippet({FTS_TABLE}, -1, %s, %s, %s, %s) AS snippet '
+        f'FROM {FTS_TABLE} '
+        f'JOIN notes_note AS note ON note.id = {FTS_TABLE}.rowid '
+        f'WHERE {FTS_TABLE} MATCH %s AND note.author_id = %s '
+        f'ORDER BY bm25({FTS_TABLE}) LIMIT %s',
+        (
+            SNIPPET_START, SNIPPET_END, '…', SNIPPET_TOKENS,
+            match_query, author.pk, limit,
+        )
+    ))
+    for note in notes:
+        note.snippet = highlight(note.snippet)
+    return notes
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .auth import invalidate_cached_user
+from .db import apply_sqlite_pragmas
+from .models import Note
+from .search import index_notes, unindex_note
+
+
+@receiver(post_save, sender=Note)
+def index_note(sender, instance, **kwargs):
+    index_notes((instance,))
+
+
+@receiver(post_delete, sender=Note)
+def remove_note_from_index(sender, instance, **kwargs):
+    unindex_note(instance.pk)
+
+
+@receiver((post_save, post_delete), sender=settings.AUTH_USER_MODEL)
+def invalidate_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_cached_user(user.pk)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    apply_sqlite_pragmas(connection)
@@ -0,0 +1,70 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import Q
+from pytils.translit import slugify
+
+# Для заголовков, из которых не получается slug (например, из одних знаков).
+DEFAULT_SLUG = 'note'
+# Сколько символов оставляем под суффикс вида «-12345».
+SUFFIX_RESERVE = 6
+
+
+@lru_cache(maxsize=settings.NOTES_SLUG_CACHE_SIZE)
+def cached_slugify(title):
+    """
+    Транслитерация заголовка с кэшем последних заголовков.
+
+    Статистика попаданий доступна через cached_slugify.cache_info().
+    """
+    return slugify(title)
+
+
+def base_slug(title, max_length):
+    """Slug из заголовка без учёта занятых значений."""
+    return cached_slugify(title)[:max_length] or DEFAULT_SLUG
+
+
+def pick_free_slug(base, taken, max_length):
+    """Первый свободный вариант из base, base-2, base-3, ..."""
+    if base not in taken:
+        return base
+    suffix = 2
+    while True:
+        tail = f'-{suffix}'
+        candidate = base[:max_length - len(tail)] + tail
+        if candidate not in taken:
+            return candidate
+        suffix += 1
+
+
+def similar_slugs(base, max_length):
+    """
+    Условие на slug, которые может занять pick_free_slug для base.
+
+    Пока суффикс дописывается к основе целиком, это сама основа
+    и варианты «основа-…». Длинную основу суффикс обрезает,
+    тогда общая у вариантов только её начальная часть.
+    Оба условия — диапазоны по уникальному индексу slug.
+    """
+    stem = base[:max_length - SUFFIX_RESERVE]
+    if stem != base:
+        return Q(slug__gte=stem, slug__lt=stem + '\uffff')
+    prefix = base + '-'
+    return Q(slug=base) | Q(slug__gte=prefix, slug__lt=prefix + '\uffff')
+
+
+def allocate_slug(model, title, instance_pk=None):
+    """
+    Свободный slug для заголовка за один запрос.
+
+    Текущий slug сохраняемой записи instance_pk занятым не считается.
+    """
+    max_length = model._meta.get_field('slug').max_length
+    base = base_slug(title, max_length)
+    taken = set(
+        model._default_manager.filter(similar_slugs(base, max_length))
+        .exclude(pk=instance_pk)
+        .values_list('slug', flat=True)
+    )
+    return pick_free_slug(base, taken, max_length)
@@ -1,9 +1,25 @@
 
+import json
+import tempfile
+from http import HTTPStatus
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.template import engines
+from django.test import (
+    Client, RequestFactory, SimpleTestCase, override_settings
+)
 from django.urls import reverse
 
+from notes import async_views
 from notes.forms import NoteForm
+from notes.metrics import request_metrics
+from notes.search import search_notes
 from notes.models import Note
 from notes.tests.common import CommonCreateObjects
+from notes.warmup import warm_up_templates
+from yanote import settings_production
 
 
 class TestNotesList(CommonCreateObjects):
@@ -36,6 +52,46 @@ class TestNotesList(CommonCreateObjects):
         sorted_dates = sorted(author_notes)
         self.assertEqual(author_notes, sorted_dates)
 
+    def test_notes_list_pages(self):
+        """Заметки выводятся страницами по курсору без пропусков."""
+        note_ids = []
+        params = {}
+        with self.settings(NOTES_PAGE_SIZE=2):
+            while params is not None:
+                response = self.author_client.get(self.NOTES_URL, params)
+                note_ids += [
+                    note.id for note in response.context['object_list']
+                ]
+                next_after = response.context['next_after']
+                params = {'after': next_after} if next_after else None
+        author_note_ids = Note.objects.filter(
+            author=self.author
+        ).order_by('id').values_list('id', flat=True)
+        self.assertEqual(note_ids, list(author_note_ids))
+
+    def test_notes_list_bad_cursor(self):
+        """Некорректный курсор, даже из цифр не ASCII, — ошибка запроса."""
+        for after in ('abc', '²', '３', '٣', '-1', '9' * 23):
+            with self.subTest(after=after):
+                response = self.author_client.get(
+                    self.NOTES_URL, {'after': after}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_notes_list_defers_text(self):
+        """Текст заметок в список не загружается."""
+        for note in self.object_list:
+            self.assertIn('text', note.get_deferred_fields())
+
+    def test_async_list_matches_sync(self):
+        """Асинхронный список заметок совпадает с синхронным."""
+        request = RequestFactory().get(self.NOTES_URL)
+        request.user = self.author
+        response = async_to_sync(async_views.notes_list)(request)
+        self.assertEqual(
+            response.content, self.author_client.get(self.NOTES_URL).content
+        )
+
     def test_authorized_client_has_create_note_form(self):
         """Проверка наличия формы на странице создания заметки."""
         response = self.author_client.get(
@@ -50,3 +106,91 @@ class TestNotesList(CommonCreateObjects):
                     kwargs={'slug': self.another_user_note.slug}))
         self.assertIn('form', response.context)
         self.assertIsInstance(response.context['form'], NoteForm)
+
+
+class TestRequestMetrics(CommonCreateObjects):
+
+    def test_metrics_disabled_by_default(self):
+        """Без настройки заголовок Server-Timing не добавляется."""
+        response = self.author_client.get(self.NOTES_URL)
+        self.assertNotIn('Server-Timing', response)
+
+    def test_metrics_recorded(self):
+        """Замеры запроса попадают в Server-Timing и сводку команды."""
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+                REQUEST_METRICS_ENABLED=True,
+                REQUEST_METRICS_DIR=directory):
+            client = Client()
+            client.force_login(self.author)
+            response = client.get(self.NOTES_URL)
+            self.assertIn('db;dur=', response['Server-Timing'])
+            request_metrics.flush(force=True)
+            output = StringIO()
+            call_command('request_metrics', stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertGreaterEqual(report['notes:list']['requests'], 1)
+
+
+class TestNoteSearch(CommonCreateObjects):
+    SEARCH_URL = reverse('notes:search')
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.note = Note.objects.create(
+            title='Список покупок',
+            text='Купить молоко и <хлеб>.',
+            author=cls.author,
+        )
+
+    def test_search_finds_author_notes(self):
+        """Поиск находит заметку по началу слова и выделяет его."""
+        response = self.author_client.get(self.SEARCH_URL, {'q': 'молок'})
+        object_list = response.context['object_list']
+        self.assertEqual([note.pk for note in object_list], [self.note.pk])
+        self.assertIn('<mark>молоко</mark>', object_list[0].snippet)
+        self.assertIn('&lt;хлеб&gt;', object_list[0].snippet)
+
+    def test_search_ignores_control_characters(self):
+        """Управляющие символы в запросе не ломают поиск."""
+        for query in ('\x00молок', '\x00', 'мол\x07ок'):
+            with self.subTest(query=query):
+                response = self.author_client.get(
+                    self.SEARCH_URL, {'q': query}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(search_notes(self.author, '\x00молок', 10)), 1)
+
+    def test_search_only_author_notes(self):
+        """Чужие заметки в поиск не попадают."""
+        response = self.another_user_client.get(
+            self.SEARCH_URL, {'q': 'молоко'}
+        )
+        self.assertEqual(list(response.context['object_list']), [])
+
+    def test_index_follows_changes(self):
+        """Индекс обновляется при изменении и удалении заметки."""
+        self.note.text = 'Купить кефир.'
+        self.note.save()
+        self.assertEqual(search_notes(self.author, 'молоко', 10), [])
+        self.assertEqual(len(search_notes(self.author, 'кефир', 10)), 1)
+        self.note.delete()
+        self.assertEqual(search_notes(self.author, 'кефир', 10), [])
+
+    def test_rebuild_index(self):
+        """Команда индексирует заметки, созданные в обход сигналов."""
+        self.assertEqual(search_notes(self.author, 'заметка0', 10), [])
+        call_command('rebuild_notes_search', batch_size=2, stdout=StringIO())
+        self.assertEqual(len(search_notes(self.author, 'заметка0', 10)), 1)
+
+
+class TestTemplateWarmUp(SimpleTestCase):
+
+    @override_settings(TEMPLATES=settings_production.TEMPLATES)
+    def test_warm_up_fills_template_cache(self):
+        """Прогрев кладёт шаблоны проекта в кэш загрузчика."""
+        self.assertGreater(warm_up_templates(), 0)
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertLessEqual(
+            {'base.html', 'notes/list.html'}, set(loader.get_template_cache)
+        )
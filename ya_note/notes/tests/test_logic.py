@@ -1,12 +1,25 @@
+import tempfile
+import threading
+import time
 from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
 from pytils.translit import slugify
 
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from notes.auth import USER_KEY
 from notes.forms import WARNING
+from notes.management.commands.loadtest import summarize_samples
 from notes.models import Note
+from notes.search import search_notes
+from notes.slugs import cached_slugify
 from notes.utils import note_counter
 
 User = get_user_model()
@@ -74,6 +87,29 @@ class TestNoteCreation(TestCase):
         )
         self.assertEqual(note.slug, slugify(note.title))
 
+    def test_auto_slug_gets_free_suffix(self):
+        """Совпадающий заголовок получает свободный суффикс в slug."""
+        Note.objects.create(
+            title=self.NOTE_TITLE, text=self.NOTE_TEXT, author=self.user
+        )
+        form_data = {'title': self.NOTE_TITLE, 'text': self.NOTE_TEXT}
+        self.auth_client.post(self.url, data=form_data)
+        self.auth_client.post(self.url, data=form_data)
+        self.assertEqual(
+            set(Note.objects.values_list('slug', flat=True)),
+            {self.NOTE_SLUG, f'{self.NOTE_SLUG}-2', f'{self.NOTE_SLUG}-3'}
+        )
+
+    def test_repeated_title_is_transliterated_once(self):
+        """Повторный заголовок берётся из кэша транслитерации."""
+        cached_slugify.cache_clear()
+        for _ in range(3):
+            Note.objects.create(
+                title=self.NOTE_TITLE, text=self.NOTE_TEXT, author=self.user
+            )
+        cache_info = cached_slugify.cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses), (2, 1))
+
 
 class TestNoteEditeDelete(TestCase):
     NOTE_TITLE = 'Название заметки'
@@ -122,6 +158,17 @@ class TestNoteEditeDelete(TestCase):
         self.note.refresh_from_db()
         self.assertEqual(self.note.text, self.NEW_NOTE_TEXT)
 
+    def test_edit_with_blank_slug_keeps_slug(self):
+        """Правка с пустым slug не меняет адрес заметки."""
+        for _ in range(2):
+            self.auth_client.post(
+                reverse('notes:edit', args=(self.note.slug,)),
+                data={**self.form_data, 'slug': ''}
+            )
+            slug = self.note.slug
+            self.note.refresh_from_db()
+            self.assertEqual(self.note.slug, slug)
+
     def test_user_cant_delete_note_of_another_user(self):
         """Другой пользователь не может удалить чужую заметку."""
         notes_before_changes = note_counter()
@@ -137,3 +184,163 @@ class TestNoteEditeDelete(TestCase):
         self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
         self.note.refresh_from_db()
         self.assertEqual(self.note.text, self.NOTE_TEXT)
+
+
+class TestConcurrentSlugs(TransactionTestCase):
+    NOTE_TITLE = 'Список покупок'
+    THREADS = 10
+    # Не дольше ~5 секунд на заметку, после этого ошибка попадает в errors.
+    ATTEMPTS = 500
+
+    def create_note(self, author, barrier, errors):
+        barrier.wait()
+        try:
+            for attempt in range(self.ATTEMPTS):
+                try:
+                    Note.objects.create(
+                        title=self.NOTE_TITLE, text='Текст', author=author
+                    )
+                    return
+                except OperationalError:
+                    # Общая in-memory база тестов не ждёт освобождения
+                    # блокировки, как файловая с busy_timeout.
+                    if attempt == self.ATTEMPTS - 1:
+                        raise
+                    time.sleep(0.01)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connection.close()
+
+    def test_same_titles_in_parallel(self):
+        """Параллельные заметки с одним заголовком получают разные slug."""
+        author = User.objects.create(username='Автор')
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+        threads = [
+            threading.Thread(
+                target=self.create_note, args=(author, barrier, errors)
+            )
+            for _ in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        slugs = list(Note.objects.values_list('slug', flat=True))
+        self.assertEqual(len(slugs), self.THREADS)
+        self.assertEqual(len(set(slugs)), self.THREADS)
+
+
+class TestQueryPlans(TestCase):
+
+    def test_view_queries_use_indexes(self):
+        """Запросы представлений не сканируют таблицы целиком."""
+        call_command('check_query_plans')
+
+
+class TestExportImport(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+        cls.reader = User.objects.create(username='Читатель')
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text=f'Текст заметки {index}',
+                slug=f'note-{index}',
+                author=cls.author,
+            )
+            for index in range(3)
+        )
+
+    def test_roundtrip_keeps_notes_and_dedupes_slugs(self):
+        """Импорт выгрузки создаёт копии заметок со свободными slug."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'notes.jsonl'
+            call_command('export_notes', str(path), stdout=StringIO())
+            self.assertEqual(len(path.read_text().splitlines()), 3)
+            call_command(
+                'import_notes', str(path),
+                author=self.reader.username, batch_size=2, stdout=StringIO()
+            )
+        imported = Note.objects.filter(author=self.reader).order_by('pk')
+        self.assertEqual(
+            [(note.title, note.text, note.slug) for note in imported],
+            [
+                (f'Заметка {index}', f'Текст заметки {index}',
+                 f'note-{index}-2')
+                for index in range(3)
+            ]
+        )
+
+
+class TestLoadtestReport(TestCase):
+
+    def test_report_counts_requests_and_errors(self):
+        """Отчёт нагрузочного теста считает запросы и ошибки по страницам."""
+        samples = [('list', 10, True), ('list', 30, True), ('add', 5, False)]
+        report = summarize_samples(samples, duration=2)
+        self.assertEqual(report['requests'], 3)
+        self.assertEqual(report['rps'], 1.5)
+        self.assertEqual(report['errors'], 1)
+        self.assertEqual(report['endpoints']['list']['requests'], 2)
+        self.assertEqual(report['endpoints']['add']['errors'], 1)
+
+
+class TestSeed(TestCase):
+
+    def test_seed_creates_notes_with_unique_slugs(self):
+        """Команда seed создаёт заметки пачками с уникальными slug."""
+        call_command('seed', users=2, notes=3, batch_size=2, verbosity=0)
+        slugs = list(Note.objects.values_list('slug', flat=True))
+        self.assertEqual(len(slugs), 6)
+        self.assertEqual(len(set(slugs)), 6)
+        note = Note.objects.first()
+        self.assertIn(note, search_notes(note.author, note.title, limit=10))
+
+    def test_seed_rejects_bad_options(self):
+        """Команда seed не принимает отрицательные числа и пустые пачки."""
+        for options in (
+            {'users': -1}, {'notes': -1}, {'batch_size': 0},
+            {'batch_size': -1},
+        ):
+            with self.subTest(options=options):
+                with self.assertRaises(CommandError):
+                    call_command('seed', verbosity=0, **options)
+        self.assertEqual(note_counter(), 0)
+
+
+class TestUserCache(TestCase):
+    NOTES_URL = reverse('notes:list')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Автор')
+
+    def setUp(self):
+        self.client.force_login(self.author)
+        self.key = USER_KEY.format(pk=self.author.pk)
+
+    def test_list_skips_session_and_user_queries(self):
+        """Сессия и пользователь после первого запроса берутся из кэша."""
+        self.client.get(self.NOTES_URL)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.NOTES_URL)
+        for query in context.captured_queries:
+            self.assertNotIn('FROM "django_session"', query['sql'])
+            self.assertNotIn('FROM "auth_user"', query['sql'])
+
+    def test_cached_user_reset_on_password_change_and_logout(self):
+        """Пользователь пропадает из кэша при смене пароля и при выходе."""
+        self.client.get(self.NOTES_URL)
+        self.assertEqual(cache.get(self.key), self.author)
+        self.author.set_password('новый пароль')
+        self.author.save()
+        self.assertIsNone(cache.get(self.key))
+        self.client.force_login(self.author)
+        self.client.get(self.NOTES_URL)
+        self.client.logout()
+        self.assertIsNone(cache.get(self.key))
@@ -53,7 +53,8 @@ class TestRoutes(TestCase):
         urls = (
             ('notes:list'),
             ('notes:success'),
-            ('notes:add')
+            ('notes:add'),
+            ('notes:search'),
         )
         for name in urls:
             with self.subTest(name=name):
@@ -87,6 +88,7 @@ class TestRoutes(TestCase):
         slug = (self.note.slug,)
         not_for_guest_urls = (
             ('notes:list', None),
+            ('notes:search', None),
             ('notes:success', None),
             ('notes:add', None),
             ('notes:detail', slug),
@@ -1,15 +1,24 @@
+from django.conf import settings
 from django.urls import path
 
-from notes import views
+from notes import async_views, views
 
 app_name = 'notes'
 
+if settings.ASYNC_READ_VIEWS:
+    list_view = async_views.notes_list
+    detail_view = async_views.note_detail
+else:
+    list_view = views.NotesList.as_view()
+    detail_view = views.NoteDetail.as_view()
+
 urlpatterns = [
     path('', views.Home.as_view(), name='home'),
     path('add/', views.NoteCreate.as_view(), name='add'),
     path('edit/<slug:slug>/', views.NoteUpdate.as_view(), name='edit'),
-    path('note/<slug:slug>/', views.NoteDetail.as_view(), name='detail'),
+    path('note/<slug:slug>/', detail_view, name='detail'),
     path('delete/<slug:slug>/', views.NoteDelete.as_view(), name='delete'),
-    path('notes/', views.NotesList.as_view(), name='list'),
+    path('notes/', list_view, name='list'),
+    path('search/', views.NoteSearch.as_view(), name='search'),
     path('done/', views.NoteSuccess.as_view(), name='success'),
 ]
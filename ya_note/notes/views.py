@@ -1,9 +1,15 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import BadRequest
 from django.urls import reverse_lazy
 from django.views import generic
 
 from .forms import NoteForm
 from .models import Note
+from .search import search_notes
+
+# Наибольшее значение id: в SQLite это 64-битное целое со знаком.
+MAX_ID = 2 ** 63 - 1
 
 
 class Home(generic.TemplateView):
@@ -50,10 +56,58 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
+    """
+    Список всех заметок пользователя.
+
+    Заметки выводятся страницами по NOTES_PAGE_SIZE: следующая страница
+    начинается после id последней показанной заметки, поэтому глубокие
+    страницы стоят столько же, сколько первая.
+    """
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        """Для списка текст заметок не нужен."""
+        queryset = super().get_queryset().only(
+            'id', 'slug', 'title'
+        ).order_by('id')
+        after = self.request.GET.get('after')
+        if after:
+            # isdigit() пропускает «²» и цифры других алфавитов.
+            is_id = after.isascii() and after.isdigit()
+            if not is_id or int(after) > MAX_ID:
+                raise BadRequest(f'Некорректный параметр after: {after}')
+            queryset = queryset.filter(id__gt=after)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        page_size = settings.NOTES_PAGE_SIZE
+        notes = list(self.object_list[:page_size + 1])
+        next_after = None
+        if len(notes) > page_size:
+            notes = notes[:page_size]
+            next_after = notes[-1].id
+        return super().get_context_data(
+            object_list=notes, next_after=next_after, **kwargs
+        )
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+
+
+class NoteSearch(NoteBase, generic.ListView):
+    """Полнотекстовый поиск по заметкам пользователя."""
+    template_name = 'notes/search.html'
+
+    def get_queryset(self):
+        return search_notes(
+            self.request.user,
+            self.request.GET.get('q', ''),
+            settings.NOTES_SEARCH_LIMIT
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        return context
@@ -22,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'notes.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -49,6 +50,9 @@ TEMPLATES = [
     },
 ]
 
+# Компилировать все шаблоны при запуске (notes.warmup).
+TEMPLATES_WARM_UP = False
+
 WSGI_APPLICATION = 'yanote.wsgi.application'
 
 
@@ -59,6 +63,18 @@ DATABASES = {
     }
 }
 
+# PRAGMA, которые выполняются при каждом подключении к SQLite.
+SQLITE_PRAGMAS = {}
+
+
+# Сессия читается из кэша, в базу запрос идёт только при промахе.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = ['notes.auth.CachedModelBackend']
+
+# Сколько секунд пользователь сессии хранится в кэше.
+USER_CACHE_TIMEOUT = 60
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -87,3 +103,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_PAGE_SIZE = 100
+
+NOTES_SEARCH_LIMIT = 50
+
+# Сколько заголовков помнит кэш транслитерации slug.
+NOTES_SLUG_CACHE_SIZE = 4096
+
+# Асинхронные страницы для чтения (notes.async_views) при запуске под ASGI.
+ASYNC_READ_VIEWS = False
+
+# Замеры запросов: Server-Timing и сводка командой request_metrics.
+REQUEST_METRICS_ENABLED = False
+REQUEST_METRICS_WINDOW = 1000
+REQUEST_METRICS_DIR = BASE_DIR / 'request_metrics'
+REQUEST_METRICS_FLUSH_INTERVAL = 10
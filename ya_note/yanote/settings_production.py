@@ -0,0 +1,55 @@
+from .settings import *  # noqa: F401, F403
+from .settings import DATABASES, TEMPLATES
+
+DEBUG = False
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            # Шаблоны разбираются один раз на процесс, а не на каждый запрос.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+TEMPLATES_WARM_UP = True
+
+# Кэш у каждого процесса свой, поэтому сессия хранится в подписанной
+# cookie: её проверяет любой процесс, не обращаясь к базе.
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+
+# Пользователь читается из базы, а не из кэша процесса: смену пароля
+# и выход, сделанные в одном процессе, другие иначе заметили бы только
+# через USER_CACHE_TIMEOUT и до тех пор принимали бы старые сессии.
+# Кэшировать пользователя можно с общим для процессов кэшем.
+AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        # Соединение живёт между запросами, а не открывается на каждый.
+        'CONN_MAX_AGE': 600,
+    }
+}
+
+SQLITE_PRAGMAS = {
+    # Читатели не блокируют писателя, а писатель — читателей.
+    'journal_mode': 'WAL',
+    # В режиме WAL это безопасно: при сбое питания теряются только
+    # последние транзакции, база не повреждается.
+    'synchronous': 'NORMAL',
+    # Ждём занятую базу до 5 секунд вместо мгновенной ошибки.
+    'busy_timeout': 5000,
+    # Кэш страниц 64 МБ (отрицательное значение — в килобайтах).
+    'cache_size': -64000,
+    'mmap_size': 256 * 2 ** 20,
+    'temp_store': 'MEMORY',
+}